@@ -0,0 +1,96 @@
+"""
+Serve concurrent file requests from a slow storage, like an ASGI worker.
+
+Compares sync file responses, which Django reads whole on the thread shared
+by sync views, with the streaming used by async file views:
+
+    python benchmarks/async_file_streaming.py [--requests 20] [--mb-per-s 50]
+"""
+
+import argparse
+import asyncio
+import io
+import time
+import warnings
+from unittest import mock
+
+from utils import setup_django
+
+
+class SlowFile(io.BytesIO):
+    """In-memory file read at the throughput of a remote storage."""
+
+    bytes_per_second = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        time.sleep(len(chunk) / self.bytes_per_second)
+        return chunk
+
+    @property
+    def size(self):
+        return len(self.getbuffer())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--size-kb", type=int, default=1024)
+    parser.add_argument("--mb-per-s", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.test import RequestFactory
+
+    from _config.services.storage_utils.file_response import (
+        build_file_response,
+    )
+    from _config.views.async_file_views import async_file_view
+
+    content = b"\0" * args.size_kb * 1024
+    SlowFile.bytes_per_second = args.mb_per_s * 1024 * 1024
+    storage = mock.Mock()
+    storage.open.side_effect = lambda *_: SlowFile(content)
+    storage.size.return_value = len(content)
+
+    def file_view(request):
+        return build_file_response(request, "background.jpg")
+
+    async_view = async_file_view(file_view)
+
+    async def consume(request, stream_async):
+        if stream_async:
+            response = await async_view(request)
+        else:
+            response = file_view(request)
+        # Same consumption as django.core.handlers.asgi.ASGIHandler.
+        async for _ in response:
+            await asyncio.sleep(0)
+
+    async def serve(stream_async):
+        requests = [RequestFactory().get("/") for _ in range(args.requests)]
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(consume(request, stream_async) for request in requests)
+        )
+        return time.perf_counter() - start
+
+    warnings.simplefilter("ignore")
+    with mock.patch(
+        "_config.services.storage_utils.file_response.default_storage",
+        storage,
+    ):
+        results = {}
+        for name, stream_async in (("sync", False), ("async", True)):
+            results[name] = asyncio.run(serve(stream_async))
+            print(
+                f"{name:<6} {args.requests} concurrent requests: "
+                f"{results[name]:.2f}s "
+                f"({args.requests / results[name]:.1f} requests/s)"
+            )
+    print(f"speedup: x{results['sync'] / results['async']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
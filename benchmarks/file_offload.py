@@ -0,0 +1,72 @@
+"""
+Compare worker time spent serving a local file with and without
+LOCAL_FILE_OFFLOAD.
+
+The response is consumed like a WSGI server would, so without offload the
+worker reads every chunk. With offload, the front proxy sends the file:
+
+    python benchmarks/file_offload.py [--size-kb 1500] [--iterations 300]
+"""
+
+import argparse
+import os
+import tempfile
+
+from utils import measure, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--size-kb",
+        type=int,
+        default=1500,
+        help="File size, default is about a 1920x1080 JPEG background.",
+    )
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.test import RequestFactory, override_settings
+
+    from _config.services.storage_utils.file_response import (
+        build_file_response,
+    )
+
+    request = RequestFactory().get("/")
+
+    def serve(file_key):
+        response = build_file_response(request, file_key)
+        for _ in response:
+            pass
+        response.close()
+
+    with tempfile.TemporaryDirectory() as media_root:
+        file_key = "v1/system-info/backgrounds/background.jpg"
+        os.makedirs(os.path.dirname(os.path.join(media_root, file_key)))
+        with open(os.path.join(media_root, file_key), "wb") as file:
+            file.write(os.urandom(args.size_kb * 1024))
+
+        results = {}
+        for offload in ("", "x-accel-redirect", "x-sendfile"):
+            with override_settings(
+                STORAGE_BACKEND="local",
+                MEDIA_ROOT=media_root,
+                LOCAL_FILE_OFFLOAD=offload,
+            ):
+                results[offload] = measure(
+                    f"offload {offload or 'off'}",
+                    lambda: serve(file_key),
+                    args.iterations,
+                )
+
+    for offload in ("x-accel-redirect", "x-sendfile"):
+        print(
+            f"{offload}: x{results[''] / results[offload]:.1f} "
+            "requests per worker second"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare presigned URL signing with a new S3 client per call against the
+shared process client.
+
+Signing is local, no S3 server is needed:
+
+    python benchmarks/s3_client.py [--iterations 200]
+"""
+
+import argparse
+
+from utils import measure, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.test import override_settings
+
+    import boto3
+    from django.conf import settings
+
+    from _config.services.storage_utils.presigned_url import get_s3_client
+
+    def create_client():
+        # Previous get_s3_client(), called for each URL.
+        return boto3.client(
+            "s3",
+            endpoint_url=settings.AWS_S3_CUSTOM_DOMAIN,
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        )
+
+    def sign(client):
+        return client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": "benchmark", "Key": "actions/1/thumbnail.png"},
+            ExpiresIn=3600,
+        )
+
+    with override_settings(
+        AWS_S3_CUSTOM_DOMAIN="http://localhost:9000",
+        AWS_ACCESS_KEY_ID="benchmark",
+        AWS_SECRET_ACCESS_KEY="benchmark",
+    ):
+        per_call = measure(
+            "new client per URL",
+            lambda: sign(create_client()),
+            args.iterations,
+        )
+        get_s3_client()  # Exclude the one-time creation.
+        shared = measure(
+            "shared client",
+            lambda: sign(get_s3_client()),
+            args.iterations,
+        )
+    print(f"speedup: x{per_call / shared:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare the authentication of API requests with and without
+JWT_STATELESS_AUTHENTICATION.
+
+Authenticates a bearer access token and checks the admin permission, like
+most API views do, for an existing user of the configured database:
+
+    python benchmarks/stateless_jwt_auth.py [--user-id 1] [--iterations 1000]
+"""
+
+import argparse
+
+from utils import measure, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--user-id", type=int, help="Default is the first active user."
+    )
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db import connection
+    from django.test import RequestFactory, override_settings
+    from django.test.utils import CaptureQueriesContext
+    from django_user_agents.utils import get_user_agent
+
+    from auths.jwt.jwt_utils import (
+        JwtCookiesAuthentication,
+        get_tokens_for_user,
+    )
+    from users.models import User
+
+    users = User.objects.filter(is_active=True).order_by("pk")
+    if args.user_id is not None:
+        users = users.filter(pk=args.user_id)
+    user = users.first()
+    if user is None:
+        parser.error("No active user found.")
+
+    request = RequestFactory().get(
+        "/",
+        HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(user)['access']}",
+    )
+    request.user_agent = get_user_agent(request)
+    authentication = JwtCookiesAuthentication()
+
+    def authenticate():
+        authenticated_user, _ = authentication.authenticate(request)
+        authenticated_user.is_admin
+
+    for stateless in (False, True):
+        name = f"stateless {'on' if stateless else 'off'}"
+        with override_settings(JWT_STATELESS_AUTHENTICATION=stateless):
+            with CaptureQueriesContext(connection) as queries:
+                authenticate()
+            print(f"{name:<40} {len(queries):8} queries/request")
+            measure(name, authenticate, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
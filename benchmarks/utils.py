@@ -0,0 +1,28 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+
+def setup_django():
+    """Configure Django with the project settings."""
+    import django
+
+    sys.path.insert(0, str(SRC_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "_config.settings")
+    django.setup()
+
+
+def measure(name: str, func, iterations: int) -> float:
+    """Run func iterations times and print the time per call."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<40} {elapsed / iterations * 1000:8.3f} ms/call "
+        f"({iterations} calls)"
+    )
+    return elapsed
@@ -0,0 +1,28 @@
+from django.db import models, transaction
+
+
+class VersionedModel(models.Model):
+    """Model whose version is bumped on each save."""
+
+    version = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        # Bump version so clients caches are invalidated. The row is locked
+        # so concurrent saves get distinct versions.
+        with transaction.atomic():
+            stored_version = None
+            if self.pk is not None:
+                stored_version = (
+                    type(self)
+                    ._default_manager.select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list("version", flat=True)
+                    .first()
+                )
+            self.version = (stored_version or 0) + 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "version"}
+            super().save(*args, **kwargs)
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.http.multipartparser import MultiPartParser as DjangoMultiPartParser
+from django.http.multipartparser import MultiPartParserError
+from rest_framework import status
+from rest_framework.exceptions import APIException, ParseError
+from rest_framework.parsers import DataAndFiles, MultiPartParser
+
+from .services.storage_utils.upload_handler import StorageUploadHandler
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Uploaded file is too large."
+    default_code = "upload_too_large"
+
+
+class StorageMultiPartParser(MultiPartParser):
+    """
+    Multipart parser writing uploaded files straight to the storage.
+
+    Uploaded files are StoredUploadedFile instances, see
+    StorageUploadHandler. Stored files are deleted if the request fails.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        request = parser_context["request"]
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        meta = request.META.copy()
+        meta["CONTENT_TYPE"] = media_type
+        handler = StorageUploadHandler(request._request)
+
+        try:
+            parser = DjangoMultiPartParser(meta, stream, [handler], encoding)
+            data, files = parser.parse()
+        except MultiPartParserError as exc:
+            handler.abort()
+            raise ParseError(f"Multipart form parse error - {exc}")
+        except BaseException:
+            handler.abort()
+            raise
+        if handler.too_large:
+            handler.abort()
+            raise UploadTooLarge(
+                "Uploaded file must be less than "
+                f"{settings.UPLOAD_MAX_SIZE // (1024 * 1024)}Mo."
+            )
+        return DataAndFiles(data, files)
@@ -49,3 +49,23 @@ class IsFileAuthenticated(BasePermission):
         request.file_key = data["file"]
 
         return True
+
+
+class IsFileUploadAuthenticated(BasePermission):
+    """Custom permission to check if a local file upload is allowed via query token."""
+    def has_permission(self, request: Request, view: APIView):
+        token = request.GET.get("token")
+        if not token:
+            raise AuthenticationFailed("Missing token")
+
+        try:
+            data = signing.loads(token, salt="local-upload-token")
+        except signing.BadSignature:
+            raise AuthenticationFailed("Invalid token")
+
+        if timezone.now().timestamp() > data["exp"]:
+            raise AuthenticationFailed("Token expired")
+
+        request.upload_key = data["file"]
+
+        return True
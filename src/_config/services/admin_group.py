@@ -0,0 +1,56 @@
+import threading
+import time
+
+from django.conf import settings
+
+# (group name, group id, monotonic expiry) of the admin group, see
+# get_admin_group_id().
+_admin_group = None
+# Incremented on reset, so lookups started before are not cached.
+_admin_group_generation = 0
+_admin_group_lock = threading.Lock()
+
+
+def get_admin_group_id():
+    """
+    Return the id of the ADMIN_GROUP group, or None if there is none.
+
+    The id is cached per process for ADMIN_GROUP_CACHE_TTL seconds. Group
+    saves and deletes reset it, the TTL bounds how long other processes
+    see a renamed or deleted group.
+    """
+    global _admin_group
+    if not settings.ADMIN_GROUP:
+        return None
+    cached = _admin_group
+    if (
+        cached is not None
+        and cached[0] == settings.ADMIN_GROUP
+        and cached[2] > time.monotonic()
+    ):
+        return cached[1]
+
+    from users.models import Group
+
+    generation = _admin_group_generation
+    group_id = (
+        Group.objects.filter(name=settings.ADMIN_GROUP)
+        .values_list("id", flat=True)
+        .first()
+    )
+    with _admin_group_lock:
+        if generation == _admin_group_generation:
+            _admin_group = (
+                settings.ADMIN_GROUP,
+                group_id,
+                time.monotonic() + settings.ADMIN_GROUP_CACHE_TTL,
+            )
+    return group_id
+
+
+def reset_admin_group_id():
+    """Forget the cached admin group id."""
+    global _admin_group, _admin_group_generation
+    with _admin_group_lock:
+        _admin_group = None
+        _admin_group_generation += 1
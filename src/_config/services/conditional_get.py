@@ -0,0 +1,45 @@
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def build_etag(*parts) -> str:
+    """Return a strong ETag built from the versions a response depends on."""
+    value = ":".join(str(part) for part in (settings.APP_VERSION, *parts))
+    return quote_etag(hashlib.sha256(value.encode()).hexdigest()[:32])
+
+
+def set_etag(response, etag: str):
+    """Set the ETag and ask clients to revalidate before reusing."""
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def get_not_modified_response(request, etag: str):
+    """Return a 304 response if the client already has this version.
+
+    Called before any queryset or serializer runs, so unchanged resources
+    cost no more than computing their ETag.
+    """
+    if not is_not_modified(request, etag):
+        return None
+    return set_etag(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+
+
+def is_not_modified(request, etag: str) -> bool:
+    """Check if a GET or HEAD request If-None-Match matches the ETag."""
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    etags = [
+        client_etag.removeprefix("W/")
+        for client_etag in parse_etags(if_none_match)
+    ]
+    return "*" in etags or etag in etags
@@ -1,4 +1,6 @@
 from .presigned_url import (
     generate_presigned_url,
-    generate_presigned_upload_url
+    generate_presigned_urls,
+    generate_presigned_upload_url,
+    get_presigned_url_epoch,
 )
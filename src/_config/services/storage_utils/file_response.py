@@ -0,0 +1,273 @@
+import hashlib
+import io
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils.cache import patch_cache_control
+from django.utils.http import content_disposition_header, quote_etag
+
+from _config.services.conditional_get import is_not_modified
+
+from .presigned_url import get_s3_client
+
+FILE_MAX_AGE = 365 * 24 * 60 * 60  # 1 year
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+def build_file_response(
+    request, file_key: str, content_type: str = None, immutable: bool = True
+):
+    """
+    Return a response serving a stored file.
+
+    Stored keys are unique per upload, so the ETag is derived from the key
+    and immutable responses can be cached for good. Single byte ranges are
+    supported.
+
+    With local storage and LOCAL_FILE_OFFLOAD set, the file is sent by the
+    front proxy from an internal redirect header instead of the worker.
+    Permissions must be checked before calling this.
+    """
+    etag = get_file_etag(file_key)
+    if is_not_modified(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        content_type = (
+            content_type
+            or mimetypes.guess_type(file_key)[0]
+            or "application/octet-stream"
+        )
+        offload = settings.STORAGE_BACKEND == "local" and bool(
+            settings.LOCAL_FILE_OFFLOAD
+        )
+        if offload:
+            response = build_offloaded_file_response(file_key, content_type)
+        elif getattr(request, "stream_file_async", False):
+            response = DeferredFileResponse(
+                request, file_key, content_type, etag
+            )
+        else:
+            response = build_stored_file_response(
+                request, file_key, content_type, etag
+            )
+    if response.status_code == 416:
+        return response
+    response["ETag"] = etag
+    if immutable:
+        patch_cache_control(
+            response, private=True, max_age=FILE_MAX_AGE, immutable=True
+        )
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def get_file_etag(file_key: str) -> str:
+    """Return the ETag of a stored file, the content of a key never changes."""
+    return quote_etag(hashlib.sha256(file_key.encode()).hexdigest()[:32])
+
+
+def build_stored_file_response(request, file_key, content_type, etag):
+    """
+    Return a response streaming a file, or the requested part of it.
+
+    Only the served bytes are read from the storage, one chunk at a time.
+    Requests served by async file views stream the file from an async
+    iterator, reading one chunk at a time outside of the event loop.
+    """
+    size = get_stored_file_size(file_key)
+    stream_async = getattr(request, "stream_file_async", False)
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    if range_header and (not if_range or if_range == etag):
+        try:
+            byte_range = parse_byte_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    if (
+        byte_range is None
+        and not stream_async
+        and settings.STORAGE_BACKEND != "s3"
+    ):
+        response = FileResponse(
+            default_storage.open(file_key, "rb"), content_type=content_type
+        )
+        response["Accept-Ranges"] = "bytes"
+        return response
+
+    start, end = byte_range or (0, size - 1)
+    file_obj = open_stored_file_range(file_key, start, end - start + 1)
+    read_range = aread_file_range if stream_async else read_file_range
+    response = StreamingHttpResponse(
+        read_range(file_obj, end - start + 1),
+        status=206 if byte_range else 200,
+        content_type=content_type,
+    )
+    response["Content-Length"] = end - start + 1
+    if byte_range:
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Accept-Ranges"] = "bytes"
+    response["Content-Disposition"] = content_disposition_header(
+        False, os.path.basename(file_key)
+    )
+    return response
+
+
+class DeferredFileResponse(HttpResponse):
+    """
+    Stored file response of an async file view, built by resolve().
+
+    Async file views resolve it outside of the thread shared by sync views,
+    where the storage requests would block the other sync views.
+    """
+
+    def __init__(self, request, file_key, content_type, etag):
+        super().__init__(content_type=content_type)
+        self.file_args = (request, file_key, content_type, etag)
+
+    def resolve(self):
+        """Return the file response, with the headers set on this one."""
+        response = build_stored_file_response(*self.file_args)
+        for header, value in self.items():
+            if response.status_code == 416 and header in (
+                "ETag",
+                "Cache-Control",
+            ):
+                continue
+            response.setdefault(header, value)
+        return response
+
+
+def get_stored_file_size(file_key: str) -> int:
+    """Return the size of a stored file, raise Http404 if there is none."""
+    if settings.STORAGE_BACKEND == "s3":
+        from botocore.exceptions import ClientError
+
+        try:
+            response = get_s3_client().head_object(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=file_key
+            )
+        except ClientError as error:
+            if error.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                raise Http404("File not found")
+            raise
+        return response["ContentLength"]
+    try:
+        return default_storage.size(file_key)
+    except FileNotFoundError:
+        raise Http404("File not found")
+
+
+def open_stored_file_range(file_key: str, start: int, length: int):
+    """
+    Return a file object reading a stored file from start.
+
+    On S3, only the range is downloaded: storage files download the whole
+    object on first read.
+    """
+    if settings.STORAGE_BACKEND != "s3":
+        file_obj = default_storage.open(file_key, "rb")
+        file_obj.seek(start)
+        return file_obj
+    if length == 0:
+        return io.BytesIO()
+    return get_s3_client().get_object(
+        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+        Key=file_key,
+        Range=f"bytes={start}-{start + length - 1}",
+    )["Body"]
+
+
+def parse_byte_range(range_header: str, size: int):
+    """
+    Return the (start, end) inclusive bounds of a single byte range.
+
+    Return None if the header is not a valid single byte range, it is then
+    ignored. Raise ValueError if the range can not be satisfied.
+    """
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", range_header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        suffix_length = int(last)
+        if suffix_length == 0 or size == 0:
+            raise ValueError("Range not satisfiable")
+        return max(size - suffix_length, 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError("Range not satisfiable")
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def read_file_range(file_obj, length: int):
+    """Yield length bytes of a file, then close it."""
+    try:
+        while length > 0:
+            chunk = file_obj.read(min(FILE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        file_obj.close()
+
+
+async def aread_file_range(file_obj, length: int):
+    """
+    Yield length bytes of a file, then close it.
+
+    Reads run in worker threads, so slow storages do not block the event
+    loop nor the thread running sync views. Only one chunk is buffered.
+    """
+
+    def run(func, *args):
+        return sync_to_async(func, thread_sensitive=False)(*args)
+
+    try:
+        while length > 0:
+            chunk = await run(file_obj.read, min(FILE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        await run(file_obj.close)
+
+
+def build_offloaded_file_response(file_key: str, content_type: str):
+    """
+    Return an empty response asking the front proxy to send a local file.
+
+    The proxy handles byte ranges itself.
+    """
+    # Raises SuspiciousFileOperation if the key leaves the media root.
+    file_path = default_storage.path(file_key)
+    response = HttpResponse(content_type=content_type)
+    if settings.LOCAL_FILE_OFFLOAD == "x-sendfile":
+        response["X-Sendfile"] = file_path
+    else:
+        response["X-Accel-Redirect"] = (
+            f"{settings.LOCAL_FILE_OFFLOAD_PREFIX.rstrip('/')}/"
+            f"{quote(file_key)}"
+        )
+    return response
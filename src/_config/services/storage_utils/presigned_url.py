@@ -1,4 +1,6 @@
 import os
+import threading
+import time
 from datetime import timedelta
 from urllib.parse import urlencode
 
@@ -9,51 +11,162 @@ from django.utils import timezone
 
 from _config.services.utils import get_full_domain_from_request
 
+from .presigned_url_cache import presigned_url_cache
+
 LOCAL_TOKEN_EXPIRATION = 3600  # 1 hour
 
+# (pid, client) of the shared S3 client, see get_s3_client().
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
 
 def generate_presigned_url(file_key, request):
     """
     Return a presigned URL to access a file.
     """
+    return generate_presigned_urls([file_key], request)[file_key]
+
+
+def generate_presigned_urls(file_keys, request) -> dict:
+    """
+    Return presigned URLs to access files, by file key.
+
+    URLs are cached per file, user and backend, and reused until the end of
+    the current presigned URL epoch, or until they are about to expire.
+    Missing URLs are signed in one pass.
+    """
+    cache_scope = get_presigned_url_cache_scope(request)
+    urls = {}
+    missing_keys = []
+    for file_key in dict.fromkeys(file_keys):
+        url = presigned_url_cache.get((*cache_scope, file_key))
+        if url is None:
+            missing_keys.append(file_key)
+        else:
+            urls[file_key] = url
+    if missing_keys:
+        reuse_deadline = get_presigned_url_reuse_deadline()
+        new_urls = build_presigned_urls(missing_keys, request)
+        for file_key, url in new_urls.items():
+            presigned_url_cache.set(
+                (*cache_scope, file_key), url, reuse_deadline
+            )
+            urls[file_key] = url
+    return urls
+
+
+def get_presigned_url_cache_scope(request) -> tuple:
+    """
+    Return the presigned URL cache key of a request, file key excluded.
+    """
+    # Local URLs are built from the request domain.
+    base_url = (
+        get_full_domain_from_request(request)
+        if settings.STORAGE_BACKEND == "local"
+        else None
+    )
+    return (settings.STORAGE_BACKEND, request.user.id, base_url)
+
+
+def build_presigned_urls(file_keys, request) -> dict:
+    """
+    Sign new URLs to access files, by file key.
+    """
     if settings.STORAGE_BACKEND == "local":
         base_url = get_full_domain_from_request(request)
-        url = default_storage.url(file_key)
-
         expires_at = (
             timezone.now() + timedelta(seconds=LOCAL_TOKEN_EXPIRATION)
         ).timestamp()
-        token_data = {
-            "file": file_key,
-            "exp": expires_at,
-            "user": request.user.id,
-        }
-        token = signing.dumps(token_data, salt="local-file-token")
-        url = f"{base_url}{url}?{urlencode({'token': token})}"
-        return url
+        # Same tokens as signing.dumps(), without a signer per file.
+        signer = signing.TimestampSigner(salt="local-file-token")
+        urls = {}
+        for file_key in file_keys:
+            token_data = {
+                "file": file_key,
+                "exp": expires_at,
+                "user": request.user.id,
+            }
+            token = signer.sign_object(token_data)
+            url = default_storage.url(file_key)
+            urls[file_key] = f"{base_url}{url}?{urlencode({'token': token})}"
+        return urls
     if settings.STORAGE_BACKEND == "s3":
-        return get_s3_client().generate_presigned_url(
-            "get_object",
-            Params={
-                "Bucket": settings.AWS_STORAGE_BUCKET_NAME,
-                "Key": file_key,
-                "ResponseContentDisposition": f'inline; filename="{os.path.basename(file_key)}"',
-            },
-            ExpiresIn=getattr(settings, "PRESIGNED_MINIO_URL_EXPIRES_IN", 7200),
-        )
+        s3_client = get_s3_client()
+        return {
+            file_key: s3_client.generate_presigned_url(
+                "get_object",
+                Params={
+                    "Bucket": settings.AWS_STORAGE_BUCKET_NAME,
+                    "Key": file_key,
+                    "ResponseContentDisposition": f'inline; filename="{os.path.basename(file_key)}"',
+                },
+                ExpiresIn=settings.PRESIGNED_URL_EXPIRES_IN,
+            )
+            for file_key in file_keys
+        }
     elif settings.STORAGE_BACKEND == "swift":
-        return default_storage.url(file_key)
+        return {
+            file_key: default_storage.url(file_key) for file_key in file_keys
+        }
     else:
         raise ValueError(f"Unknown storage backend: {settings.STORAGE_BACKEND}")
 
 
+def get_presigned_url_lifetime() -> int:
+    """
+    Return the lifetime of presigned URLs, in seconds.
+    """
+    if settings.STORAGE_BACKEND == "local":
+        return LOCAL_TOKEN_EXPIRATION
+    if settings.STORAGE_BACKEND == "swift":
+        return settings.SWIFT_TEMP_URL_DURATION
+    return settings.PRESIGNED_URL_EXPIRES_IN
+
+
+def get_presigned_url_epoch() -> int:
+    """
+    Return a counter increased every half presigned URL lifetime.
+
+    Responses embedding presigned URLs include it in their ETag, so a client
+    revalidating a cached response never keeps URLs about to expire.
+    """
+    return int(time.time() // (get_presigned_url_lifetime() / 2))
+
+
+def get_presigned_url_reuse_deadline() -> float:
+    """
+    Return the timestamp until which a URL signed now can be reused.
+
+    Reuse stops with the current presigned URL epoch, so responses validated
+    by an ETag including the epoch never embed URLs past half their lifetime.
+    """
+    now = time.time()
+    lifetime = get_presigned_url_lifetime()
+    epoch_end = (int(now // (lifetime / 2)) + 1) * (lifetime / 2)
+    return min(epoch_end, now + lifetime - settings.PRESIGNED_URL_CACHE_MARGIN)
+
+
 def generate_presigned_upload_url(
-    key: str, content_type: str = "application/octet-stream"
+    key: str, content_type: str = "application/octet-stream", request=None
 ):
     """
     Return a presigned URL to upload a file.
+
+    Local URLs point to the local upload view, built from the request.
     """
-    if settings.STORAGE_BACKEND == "s3":
+    if settings.STORAGE_BACKEND == "local":
+        token_data = {
+            "file": key,
+            "exp": (
+                timezone.now() + timedelta(seconds=LOCAL_TOKEN_EXPIRATION)
+            ).timestamp(),
+        }
+        token = signing.dumps(token_data, salt="local-upload-token")
+        base_url = get_full_domain_from_request(request)
+        url = default_storage.url(key)
+        return f"{base_url}{url}?{urlencode({'token': token})}"
+
+    elif settings.STORAGE_BACKEND == "s3":
         return get_s3_client().generate_presigned_url(
             "put_object",
             Params={
@@ -61,7 +174,7 @@ def generate_presigned_upload_url(
                 "Key": key,
                 "ContentType": content_type,
             },
-            ExpiresIn=getattr(settings, "PRESIGNED_MINIO_URL_EXPIRES_IN", 7200),
+            ExpiresIn=settings.PRESIGNED_URL_EXPIRES_IN,
         )
 
     elif settings.STORAGE_BACKEND == "swift":
@@ -93,13 +206,38 @@ def generate_presigned_upload_url(
 
 def get_s3_client():
     """
-    Return an S3 client to interact with the S3 backend.
+    Return the S3 client of the current process.
+
+    The client is created on first use and shared by all threads, boto3
+    clients being thread-safe. A forked process creates its own client since
+    connection pools can not be shared across processes.
+    """
+    global _s3_client
+    pid = os.getpid()
+    s3_client = _s3_client
+    if s3_client is None or s3_client[0] != pid:
+        with _s3_client_lock:
+            if _s3_client is None or _s3_client[0] != pid:
+                _s3_client = (pid, create_s3_client())
+            s3_client = _s3_client
+    return s3_client[1]
+
+
+def create_s3_client():
+    """
+    Return a new S3 client to interact with the S3 backend.
     """
     import boto3
+    from botocore.config import Config
 
-    return boto3.client(
+    return boto3.session.Session().client(
         "s3",
         endpoint_url=settings.AWS_S3_CUSTOM_DOMAIN,
         aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
         aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        config=Config(
+            max_pool_connections=settings.AWS_S3_MAX_POOL_CONNECTIONS,
+            connect_timeout=settings.AWS_S3_CONNECT_TIMEOUT,
+            read_timeout=settings.AWS_S3_READ_TIMEOUT,
+        ),
     )
@@ -0,0 +1,48 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class PresignedUrlCache:
+    """
+    Process-local LRU cache of presigned URLs.
+
+    Each URL is stored with the timestamp until which it can be reused.
+    """
+
+    def __init__(self):
+        self._urls = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached URL, or None if missing or no longer reusable."""
+        with self._lock:
+            entry = self._urls.get(key)
+            if entry is None:
+                return None
+            url, reuse_until = entry
+            if reuse_until <= time.time():
+                del self._urls[key]
+                return None
+            self._urls.move_to_end(key)
+            return url
+
+    def set(self, key, url, reuse_until: float):
+        """Store a URL, evicting the least recently used ones if full."""
+        max_size = settings.PRESIGNED_URL_CACHE_SIZE
+        if max_size <= 0 or reuse_until <= time.time():
+            return
+        with self._lock:
+            self._urls[key] = (url, reuse_until)
+            self._urls.move_to_end(key)
+            while len(self._urls) > max_size:
+                self._urls.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._urls.clear()
+
+
+presigned_url_cache = PresignedUrlCache()
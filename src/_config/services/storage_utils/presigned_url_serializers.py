@@ -0,0 +1,56 @@
+from django.db import models
+from rest_framework import serializers
+
+from .presigned_url import generate_presigned_url, generate_presigned_urls
+
+
+class PresignedUrlSerializerMixin:
+    """
+    Serializer mixin reading presigned URLs signed in batch.
+
+    Serializers return the storage keys an instance needs from
+    get_presigned_keys() and read their URLs with get_presigned_url().
+    """
+
+    def get_presigned_keys(self, instance) -> list:
+        """Return storage keys of the presigned URLs an instance needs."""
+        return []
+
+    def get_presigned_url(self, key: str) -> str:
+        """Return a presigned URL, signed in batch if possible."""
+        presigned_urls = self.context.get("presigned_urls", {})
+        if key in presigned_urls:
+            return presigned_urls[key]
+        return generate_presigned_url(key, self.context["request"])
+
+
+class PresignedUrlListSerializer(serializers.ListSerializer):
+    """
+    List serializer signing the presigned URLs of all items in one batch.
+
+    URLs are shared through the root serializer context, so nested lists
+    reuse URLs already signed.
+    """
+
+    def to_representation(self, data):
+        iterable = (
+            data.all() if isinstance(data, models.manager.BaseManager) else data
+        )
+        instances = list(iterable)
+        self.sign_presigned_keys(instances)
+        return super().to_representation(instances)
+
+    def sign_presigned_keys(self, instances):
+        """Sign presigned URLs needed by instances into the context."""
+        request = self.context.get("request")
+        if request is None:
+            return
+        presigned_urls = self.context.setdefault("presigned_urls", {})
+        keys = [
+            key
+            for instance in instances
+            for key in self.child.get_presigned_keys(instance)
+            if key not in presigned_urls
+        ]
+        if keys:
+            presigned_urls.update(generate_presigned_urls(keys, request))
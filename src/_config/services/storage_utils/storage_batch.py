@@ -0,0 +1,98 @@
+import os
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+from .presigned_url import get_s3_client
+
+# Maximum number of keys of an S3 DeleteObjects request.
+S3_DELETE_BATCH_SIZE = 1000
+
+
+def iter_stored_file_batches(prefix: str, batch_size: int = 1000):
+    """
+    Yield lists of (key, modified datetime) of the files under a prefix.
+
+    S3 objects are listed one page at a time, so memory use is bounded by
+    the batch size.
+    """
+    if settings.STORAGE_BACKEND == "s3":
+        paginator = get_s3_client().get_paginator("list_objects_v2")
+        for page in paginator.paginate(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+            Prefix=prefix,
+            PaginationConfig={"PageSize": batch_size},
+        ):
+            batch = [
+                (stored_object["Key"], stored_object["LastModified"])
+                for stored_object in page.get("Contents", [])
+            ]
+            if batch:
+                yield batch
+        return
+
+    batch = []
+    for key in iter_stored_file_keys(prefix):
+        batch.append((key, default_storage.get_modified_time(key)))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_stored_file_keys(prefix: str):
+    """Yield the keys of the files under a prefix, from the storage API."""
+    if settings.STORAGE_BACKEND == "local":
+        root = default_storage.path("")
+        for directory, _, filenames in os.walk(default_storage.path(prefix)):
+            relative_directory = os.path.relpath(directory, root)
+            for filename in filenames:
+                yield os.path.join(relative_directory, filename).replace(
+                    os.sep, "/"
+                )
+        return
+
+    directories, filenames = default_storage.listdir(prefix)
+    for filename in filenames:
+        yield f"{prefix.rstrip('/')}/{filename}"
+    for directory in directories:
+        yield from iter_stored_file_keys(f"{prefix.rstrip('/')}/{directory}/")
+
+
+def delete_stored_files(keys: list) -> list:
+    """
+    Delete stored files, in bulk on S3, and return the keys not deleted.
+    """
+    if settings.STORAGE_BACKEND == "s3":
+        errors = []
+        s3_client = get_s3_client()
+        for start in range(0, len(keys), S3_DELETE_BATCH_SIZE):
+            response = s3_client.delete_objects(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                Delete={
+                    "Objects": [
+                        {"Key": key}
+                        for key in keys[start : start + S3_DELETE_BATCH_SIZE]
+                    ],
+                    "Quiet": True,
+                },
+            )
+            errors.extend(error["Key"] for error in response.get("Errors", []))
+        return errors
+
+    errors = []
+    for key in keys:
+        try:
+            default_storage.delete(key)
+        except OSError:
+            errors.append(key)
+    return errors
+
+
+def to_aware_datetime(value) -> datetime:
+    """Return a datetime as UTC if it has no timezone."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
@@ -0,0 +1,167 @@
+import os
+import tempfile
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+from .presigned_url import get_s3_client
+
+# Minimum size of S3 multipart upload parts, except the last one.
+S3_PART_SIZE = 8 * 1024 * 1024
+
+
+def open_storage_writer(key: str):
+    """Return a writer streaming a new file to the storage backend."""
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorageWriter(key)
+    if settings.STORAGE_BACKEND == "s3":
+        return S3StorageWriter(key)
+    return SpooledStorageWriter(key)
+
+
+class StorageWriter(ABC):
+    """
+    Write a file to the storage chunk by chunk.
+
+    close() returns the key of the stored file, abort() discards it.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.size = 0
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        self.write_chunk(chunk)
+
+    @abstractmethod
+    def write_chunk(self, chunk: bytes):
+        pass
+
+    @abstractmethod
+    def close(self) -> str:
+        pass
+
+    @abstractmethod
+    def abort(self):
+        pass
+
+
+class LocalStorageWriter(StorageWriter):
+    """Write a file in the media root."""
+
+    def __init__(self, key: str):
+        super().__init__(key)
+        # Raises SuspiciousFileOperation if the key leaves the media root.
+        self.path = default_storage.path(key)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.file = open(self.path, "xb")
+
+    def write_chunk(self, chunk: bytes):
+        self.file.write(chunk)
+
+    def close(self) -> str:
+        self.file.close()
+        if default_storage.file_permissions_mode is not None:
+            os.chmod(self.path, default_storage.file_permissions_mode)
+        return self.key
+
+    def abort(self):
+        self.file.close()
+        os.remove(self.path)
+
+
+class S3StorageWriter(StorageWriter):
+    """
+    Write a file to the S3 bucket with a multipart upload.
+
+    Chunks are buffered up to S3_PART_SIZE, the minimum part size. Files
+    smaller than a part are sent in a single request.
+    """
+
+    def __init__(self, key: str):
+        super().__init__(key)
+        self.client = get_s3_client()
+        self.buffer = bytearray()
+        self.upload_id = None
+        self.parts = []
+
+    def write_chunk(self, chunk: bytes):
+        self.buffer += chunk
+        while len(self.buffer) >= S3_PART_SIZE:
+            self.upload_part(bytes(self.buffer[:S3_PART_SIZE]))
+            del self.buffer[:S3_PART_SIZE]
+
+    def upload_part(self, data: bytes):
+        if self.upload_id is None:
+            self.upload_id = self.client.create_multipart_upload(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=self.key
+            )["UploadId"]
+        part_number = len(self.parts) + 1
+        response = self.client.upload_part(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        self.parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+
+    def close(self) -> str:
+        if self.upload_id is None:
+            self.client.put_object(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                Key=self.key,
+                Body=bytes(self.buffer),
+            )
+        else:
+            if self.buffer:
+                self.upload_part(bytes(self.buffer))
+            self.client.complete_multipart_upload(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                Key=self.key,
+                UploadId=self.upload_id,
+                MultipartUpload={"Parts": self.parts},
+            )
+        self.buffer = bytearray()
+        return self.key
+
+    def abort(self):
+        self.buffer = bytearray()
+        if self.upload_id is not None:
+            self.client.abort_multipart_upload(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                Key=self.key,
+                UploadId=self.upload_id,
+            )
+
+
+class SpooledStorageWriter(StorageWriter):
+    """
+    Write a file through the storage save(), for other backends (Swift).
+
+    Chunks are spooled to a temporary file past FILE_UPLOAD_MAX_MEMORY_SIZE,
+    which the storage then reads by chunks.
+    """
+
+    def __init__(self, key: str):
+        super().__init__(key)
+        self.file = tempfile.SpooledTemporaryFile(
+            max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE,
+            dir=settings.FILE_UPLOAD_TEMP_DIR,
+        )
+
+    def write_chunk(self, chunk: bytes):
+        self.file.write(chunk)
+
+    def close(self) -> str:
+        self.file.seek(0)
+        try:
+            return default_storage.save(self.key, File(self.file))
+        finally:
+            self.file.close()
+
+    def abort(self):
+        self.file.close()
@@ -0,0 +1,174 @@
+import io
+import os
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import (
+    FileUploadHandler,
+    StopFutureHandlers,
+    StopUpload,
+)
+
+from .presigned_url import get_s3_client
+from .storage_writer import open_storage_writer
+
+UPLOADS_BASE_KEY = "v1/uploads/"
+
+# Size of the file start kept in memory, to read image headers without
+# fetching the stored file.
+STORED_FILE_HEAD_SIZE = 256 * 1024
+
+
+def read_stored_file_head(key: str) -> bytes:
+    """Return the first STORED_FILE_HEAD_SIZE bytes of a stored file."""
+    if settings.STORAGE_BACKEND == "s3":
+        # Storage files download the whole object on first read.
+        response = get_s3_client().get_object(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+            Key=key,
+            Range=f"bytes=0-{STORED_FILE_HEAD_SIZE - 1}",
+        )
+        return response["Body"].read()
+    with default_storage.open(key, "rb") as file:
+        return file.read(STORED_FILE_HEAD_SIZE)
+
+
+class StorageUploadHandler(FileUploadHandler):
+    """
+    Upload handler writing uploaded files straight to the storage.
+
+    Files are streamed chunk by chunk under UPLOADS_BASE_KEY, so memory use
+    is bounded by the chunk size (or the S3 part size) instead of the file
+    size. Uploads larger than UPLOAD_MAX_SIZE are stopped.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.writer = None
+        self.head = bytearray()
+        self.uploaded_files = []
+        self.too_large = False
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        ext = os.path.splitext(self.file_name)[1].lower()
+        self.writer = open_storage_writer(
+            UPLOADS_BASE_KEY
+            + default_storage.get_valid_name(f"{uuid.uuid4().hex}{ext}")
+        )
+        self.head = bytearray()
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > settings.UPLOAD_MAX_SIZE:
+            self.too_large = True
+            raise StopUpload(connection_reset=True)
+        if len(self.head) < STORED_FILE_HEAD_SIZE:
+            self.head += raw_data[: STORED_FILE_HEAD_SIZE - len(self.head)]
+        self.writer.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        key = self.writer.close()
+        self.writer = None
+        uploaded_file = StoredUploadedFile(
+            key,
+            bytes(self.head),
+            name=self.file_name,
+            content_type=self.content_type,
+            size=file_size,
+            charset=self.charset,
+            content_type_extra=self.content_type_extra,
+        )
+        self.uploaded_files.append(uploaded_file)
+        return uploaded_file
+
+    def upload_interrupted(self):
+        self.abort()
+
+    def abort(self):
+        """Discard the file being written and the files already stored."""
+        if self.writer is not None:
+            self.writer.abort()
+            self.writer = None
+        for uploaded_file in self.uploaded_files:
+            uploaded_file.close()
+
+
+class StoredUploadedFile(UploadedFile):
+    """
+    Uploaded file already written to the storage.
+
+    The stored file is deleted on close, unless claimed with
+    claim_storage_key() to be kept.
+    """
+
+    def __init__(self, storage_key: str, head: bytes, **kwargs):
+        super().__init__(
+            StoredFileReader(storage_key, head, kwargs["size"]), **kwargs
+        )
+        self.storage_key = storage_key
+        self.claimed = False
+
+    def claim_storage_key(self) -> str:
+        """Return the key of the stored file, which is kept from now on."""
+        self.claimed = True
+        return self.storage_key
+
+    def close(self):
+        self.file.close()
+        if not self.claimed:
+            default_storage.delete(self.storage_key)
+            self.claimed = True
+
+
+class StoredFileReader(io.RawIOBase):
+    """
+    Read-only file reading a stored file, from its head kept in memory.
+
+    The stored file is only opened when reading past the head.
+    """
+
+    def __init__(self, storage_key: str, head: bytes, size: int):
+        self.storage_key = storage_key
+        self.head = head
+        self.size = size
+        self.position = 0
+        self.stored_file = None
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self.position = max(offset, 0)
+        return self.position
+
+    def readinto(self, buffer):
+        if self.position < len(self.head):
+            data = self.head[self.position : self.position + len(buffer)]
+        else:
+            if self.stored_file is None:
+                self.stored_file = default_storage.open(self.storage_key, "rb")
+            self.stored_file.seek(self.position)
+            data = self.stored_file.read(len(buffer))
+        buffer[: len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+    def close(self):
+        if self.stored_file is not None:
+            self.stored_file.close()
+            self.stored_file = None
+        super().close()
@@ -49,6 +49,7 @@ INSTALLED_APPS = [
     "actions",
     "system",
     "workspaces",
+    "files",
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
@@ -144,10 +145,37 @@ if STORAGE_BACKEND not in list(STORAGE_BACKEND_STRATEGIES.keys()):
 
 DEFAULT_FILE_STORAGE = STORAGE_BACKEND_STRATEGIES[STORAGE_BACKEND]
 
+# Uploaded files are streamed to the storage, larger uploads are stopped.
+UPLOAD_MAX_SIZE = int(os.getenv("UPLOAD_MAX_SIZE_MB", "100")) * 1024 * 1024
+
+# Serve stored files from async views, streaming them in bounded chunks
+# outside of the thread shared by sync views. Meant for ASGI deployments
+# (see start.sh).
+ASYNC_FILE_VIEWS = os.getenv("ASYNC_FILE_VIEWS", "true").lower() in (
+    "true",
+    "1",
+)
+
 ### LOCAL - FILE STORAGE ###
 
 MEDIA_ROOT = os.getenv("LOCAL_MEDIA_ROOT", "/app/files")
 
+# Let the front proxy send local files once the request is authorized:
+# "x-accel-redirect" (nginx) or "x-sendfile" (Apache, lighttpd, Caddy).
+# With nginx, LOCAL_FILE_OFFLOAD_PREFIX must be an internal location
+# serving MEDIA_ROOT, e.g. location /protected-files/ { internal;
+# alias /app/files/; }
+LOCAL_FILE_OFFLOAD = os.getenv("LOCAL_FILE_OFFLOAD", "").lower()
+LOCAL_FILE_OFFLOAD_PREFIX = os.getenv(
+    "LOCAL_FILE_OFFLOAD_PREFIX", "/protected-files/"
+)
+
+if LOCAL_FILE_OFFLOAD not in ("", "x-accel-redirect", "x-sendfile"):
+    raise ValueError(
+        f"Invalid LOCAL_FILE_OFFLOAD '{LOCAL_FILE_OFFLOAD}'. "
+        "Supported values: ['x-accel-redirect', 'x-sendfile']"
+    )
+
 ### S3 - OBJECT STORAGE ###
 
 AWS_ACCESS_KEY_ID = os.getenv("S3_ACCESS_KEY_ID", None)
@@ -162,6 +190,10 @@ AWS_S3_SECURE_URLS = os.getenv("S3_SECURE_URLS", "true").lower() in (
 AWS_S3_USE_SSL = os.getenv("S3_USE_SSL", "true").lower() in ("true", "1")
 AWS_REGION = os.getenv("S3_REGION", "us-east-1")
 PRESIGNED_URL_EXPIRES_IN = int(os.getenv("PRESIGNED_URL_EXPIRES_IN", "7200"))
+# Shared S3 client used to sign URLs (timeouts in seconds).
+AWS_S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "50"))
+AWS_S3_CONNECT_TIMEOUT = int(os.getenv("S3_CONNECT_TIMEOUT", "5"))
+AWS_S3_READ_TIMEOUT = int(os.getenv("S3_READ_TIMEOUT", "30"))
 
 ### SWIFT - OBJECT STORAGE ###
 
@@ -182,6 +214,13 @@ SWIFT_TEMP_URL_DURATION = int(
 )  # 1h
 SWIFT_AUTH_VERSION = os.getenv("SWIFT_AUTH_VERSION", "3")
 
+### PRESIGNED URLS ###
+
+# Max number of presigned URLs reused by each process (0 to disable).
+PRESIGNED_URL_CACHE_SIZE = int(os.getenv("PRESIGNED_URL_CACHE_SIZE", "10000"))
+# Cached URLs are not reused when they expire in less than this (seconds).
+PRESIGNED_URL_CACHE_MARGIN = int(os.getenv("PRESIGNED_URL_CACHE_MARGIN", "300"))
+
 ##################
 # AUTHENTICATION #
 ##################
@@ -204,6 +243,11 @@ PASSWORD_BASED_AUTHENTICATION = os.getenv(
 ).lower() in ("true", "1", "t")
 ACCESS_TOKEN_LIFETIME = int(os.getenv("ACCESS_TOKEN_LIFETIME", "15"))
 REFRESH_TOKEN_LIFETIME = int(os.getenv("REFRESH_TOKEN_LIFETIME", "43200"))
+# Authenticate requests from the claims of the access token, without loading
+# the user. Deactivations and role changes apply when the token is refreshed.
+JWT_STATELESS_AUTHENTICATION = os.getenv(
+    "JWT_STATELESS_AUTHENTICATION", "false"
+).lower() in ("true", "1", "t")
 
 JWT_SIGNING_KEY, JWT_VERIFYING_KEY = get_jwt_rs256_keys()
 
@@ -297,6 +341,9 @@ SCIM_SERVICE_PROVIDER = {
 }
 
 ADMIN_GROUP = os.getenv("ADMIN_GROUP", None)
+# Seconds the admin group id is reused by each process. Group changes reset
+# it in the process making them.
+ADMIN_GROUP_CACHE_TTL = int(os.getenv("ADMIN_GROUP_CACHE_TTL", "60"))
 
 ###########
 # LOGGING #
@@ -401,10 +448,26 @@ DEFAULT_PAGE_SIZE_QUERY_PARAM = "limit"
 
 SIMPLE_HISTORY_FILEFIELD_TO_CHARFIELD = True
 
+### SYSTEM INFO ###
+
+# Seconds each process reuses the system info before checking its version
+# (0 to read it on every use).
+SYSTEM_INFO_CACHE_TTL = int(os.getenv("SYSTEM_INFO_CACHE_TTL", "5"))
+
 ### UPLOADED IMAGES ###
 
 GALLERY_BACKGROUND_IMAGE_RESOLUTION = (1920, 1080)
 GALLERY_BACKGROUND_IMAGE_FORMAT = "PNG"
+# Widths of the smaller and larger background variants, served by size hint.
+GALLERY_BACKGROUND_IMAGE_VARIANT_WIDTHS = (640, 1280, 1920, 3840)
+# Processes resizing uploaded images off-request, per worker. 0 resizes
+# them inline, before the upload response.
+IMAGE_PROCESSING_WORKERS = int(os.getenv("IMAGE_PROCESSING_WORKERS", "2"))
+# Seconds after which unfinished image processing jobs are considered lost,
+# e.g. by a restarted worker, see the recover_image_processing_jobs command.
+IMAGE_PROCESSING_JOB_TIMEOUT = int(
+    os.getenv("IMAGE_PROCESSING_JOB_TIMEOUT", "600")
+)
 
 ### JUMPER FRONTEND UPDATES ###
 
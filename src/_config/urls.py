@@ -9,6 +9,11 @@ from .views.front_updater_views import check_update
 
 router = routers.DefaultRouter(trailing_slash=False)
 
+if settings.ASYNC_FILE_VIEWS:
+    from .views.async_file_views import async_file_urls
+else:
+    async_file_urls = []
+
 urlpatterns = [
     path("", get_app_info, name="app-info"),
     path("v1/", get_app_info, name="app-info"),
@@ -16,6 +21,7 @@ urlpatterns = [
         "v1/",
         include(
             [
+                *async_file_urls,
                 *router.urls,
                 path("auth/config", get_app_info, name="app-info"),
                 path("info", get_app_info, name="app-info"),
@@ -27,6 +33,7 @@ urlpatterns = [
                 path("", include("actions.urls")),
                 path("", include("system.urls")),
                 path("", include("workspaces.urls")),
+                path("", include("files.urls")),
                 # Documentation routes
                 *swagger_urls,
             ]
@@ -0,0 +1,76 @@
+from asgiref.sync import sync_to_async
+from django.urls import re_path
+
+from _config.services.storage_utils.file_response import (
+    DeferredFileResponse,
+)
+from actions.views.action_viewset import ActionViewSet
+from system.views import system_default_background_file
+from users.views.user_preferences_viewset import UserPreferencesViewSet
+from users.views.user_viewset import UserViewSet
+
+
+def async_file_view(view):
+    """
+    Return an async version of a file view.
+
+    Authentication, permissions and file lookup still run in the sync view.
+    Storage requests then run in other threads, and the file is streamed by
+    the event loop in bounded chunks. Under ASGI, sync file responses are
+    read whole on the single thread shared by all sync views of the worker.
+    """
+    sync_view = sync_to_async(view)
+
+    async def async_view(request, *args, **kwargs):
+        request.stream_file_async = True
+        response = await sync_view(request, *args, **kwargs)
+        if isinstance(response, DeferredFileResponse):
+            response = await sync_to_async(
+                response.resolve, thread_sensitive=False
+            )()
+        return response
+
+    async_view.csrf_exempt = getattr(view, "csrf_exempt", False)
+    return async_view
+
+
+def get_action_view(viewset, basename: str, action_name: str):
+    """Return the view of a viewset GET detail action, as routed."""
+    action = getattr(viewset, action_name)
+    return viewset.as_view(
+        {"get": action_name},
+        basename=basename,
+        detail=True,
+        **action.kwargs,
+    )
+
+
+# Same routes as the sync file views, mounted before them when
+# ASYNC_FILE_VIEWS is enabled.
+async_file_urls = [
+    re_path(
+        r"^actions/(?P<pk>[^/.]+)/thumbnails/(?P<filename>[\w\-\.]+)$",
+        async_file_view(get_action_view(ActionViewSet, "actions", "thumbnail")),
+    ),
+    re_path(
+        r"^system-info/default-background/(?P<filename>[^/]+)$",
+        async_file_view(system_default_background_file),
+    ),
+    re_path(
+        r"^user-preferences/(?P<pk>[^/.]+)/backgrounds/"
+        r"(?P<filename>[\w\-\.]+)$",
+        async_file_view(
+            get_action_view(
+                UserPreferencesViewSet,
+                "user-preferences",
+                "user_preference_background_file",
+            )
+        ),
+    ),
+    re_path(
+        r"^users/(?P<pk>[^/.]+)/profile/(?P<filename>[\w\-\.]+)$",
+        async_file_view(
+            get_action_view(UserViewSet, "user", "profile_picture")
+        ),
+    ),
+]
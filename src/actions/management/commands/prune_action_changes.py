@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from actions.models.action_change_models import ActionChange
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete old action catalog changes. Clients with an older cursor "
+        "get a full catalog on their next sync."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Keep changes newer than this number of days (default: 30).",
+        )
+
+    def handle(self, *args, **options):
+        latest_id = (
+            ActionChange.objects.order_by("-id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        if latest_id is None:
+            self.stdout.write("No action changes to prune.")
+            return
+        # The latest change is always kept so cursors stay comparable.
+        deleted, _ = ActionChange.objects.filter(
+            date__lt=timezone.now() - timedelta(days=options["days"]),
+            id__lt=latest_id,
+        ).delete()
+        self.stdout.write(
+            self.style.SUCCESS(f"{deleted} action changes pruned.")
+        )
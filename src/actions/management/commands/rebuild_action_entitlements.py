@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from actions.models.action_entitlement_models import (
+    diff_action_entitlements,
+    sync_action_entitlements,
+)
+
+
+class Command(BaseCommand):
+    help = "Rebuild the action entitlement index, or check it for drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report drift, exit with an error if any is found.",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            missing, stale = diff_action_entitlements()
+            self.stdout.write(
+                f"{len(missing)} missing and {len(stale)} stale "
+                "action entitlements."
+            )
+            if missing or stale:
+                raise CommandError("Action entitlements have drifted.")
+            return
+
+        added, removed = sync_action_entitlements()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Action entitlements rebuilt: {len(added)} added, "
+                f"{len(removed)} removed."
+            )
+        )
@@ -0,0 +1,85 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:27
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_action_entitlements(apps, schema_editor):
+    Action = apps.get_model("actions", "Action")
+    ActionEntitlement = apps.get_model("actions", "ActionEntitlement")
+    user_paths = [
+        (Action.users.through, "user"),
+        (Action.groups.through, "group__user_set"),
+        (Action.roles.through, "role__users"),
+        (Action.roles.through, "role__groups__user_set"),
+    ]
+    entitlements = set()
+    for through_model, user_path in user_paths:
+        entitlements.update(
+            through_model.objects.filter(
+                **{f"{user_path}__isnull": False}
+            ).values_list("action_id", user_path)
+        )
+    ActionEntitlement.objects.bulk_create(
+        [
+            ActionEntitlement(action_id=action_id, user_id=user_id)
+            for action_id, user_id in entitlements
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("actions", "0018_alter_action_description_and_more"),
+        ("users", "0007_userpreferences_allow_showing_description"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ActionEntitlement",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "action",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="entitlements",
+                        to="actions.action",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="action_entitlements",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Action entitlement",
+                "verbose_name_plural": "Action entitlements",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="actionentitlement",
+            constraint=models.UniqueConstraint(
+                fields=("user", "action"), name="unique_action_entitlement"
+            ),
+        ),
+        migrations.RunPython(
+            populate_action_entitlements, migrations.RunPython.noop
+        ),
+    ]
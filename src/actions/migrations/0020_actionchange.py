@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("actions", "0019_actionentitlement"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ActionChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("action_id", models.BigIntegerField()),
+                ("date", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Action change",
+                "verbose_name_plural": "Action changes",
+                "indexes": [
+                    models.Index(
+                        fields=["user", "id"],
+                        name="actions_act_user_id_434f05_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+import actions.models.action_change_models
+
+
+def delete_action_changes(apps, schema_editor):
+    # Cursors handed out were row ids, clients get a full catalog once.
+    apps.get_model("actions", "ActionChange").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("actions", "0020_actionchange"),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_action_changes, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name="actionchange",
+            name="txid",
+            field=models.BigIntegerField(db_index=True, default=0),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name="actionchange",
+            name="txid",
+            field=models.BigIntegerField(
+                db_index=True,
+                default=actions.models.action_change_models.CurrentTransactionId,
+            ),
+        ),
+    ]
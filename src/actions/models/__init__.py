@@ -1,4 +1,13 @@
 from .action_models import Action
 from .action_data_models import ActionData, PythonActionData, LinkActionData
+from .action_entitlement_models import ActionEntitlement
+from .action_change_models import ActionChange
 
-__all__ = ["Action", "ActionData", "PythonActionData", "LinkActionData"]
\ No newline at end of file
+__all__ = [
+    "Action",
+    "ActionData",
+    "PythonActionData",
+    "LinkActionData",
+    "ActionEntitlement",
+    "ActionChange",
+]
@@ -0,0 +1,106 @@
+from django.db import connections, models
+from django.db.models import Func, Min, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.models import User
+
+from .action_models import Action
+
+
+class CurrentTransactionId(Func):
+    """Id of the current PostgreSQL transaction."""
+
+    template = "pg_current_xact_id()::text::bigint"
+    output_field = models.BigIntegerField()
+
+
+class ActionChange(models.Model):
+    """Action catalog change log.
+
+    Each row tells that an action may have changed for everyone (no user) or
+    for a single user (access granted or revoked). Catalog cursors are
+    transaction ids, as row ids are allocated before transactions commit.
+    """
+
+    action_id = models.BigIntegerField()
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="+",
+        blank=True,
+        null=True,
+        db_index=False,
+    )
+    txid = models.BigIntegerField(db_index=True, default=CurrentTransactionId)
+    date = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Action change"
+        verbose_name_plural = "Action changes"
+        indexes = [
+            models.Index(fields=["user", "id"]),
+        ]
+
+    @classmethod
+    def get_cursor(cls) -> int:
+        """
+        Return the cursor covering every committed change.
+
+        Transactions older than the oldest one still running are all
+        committed or rolled back, so their changes are all visible. Changes
+        of later transactions are returned again from this cursor.
+        """
+        with connections[cls.objects.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+            )
+            return cursor.fetchone()[0]
+
+    @classmethod
+    def is_cursor_valid(cls, cursor: int) -> bool:
+        """Check if changes since cursor are still in the log."""
+        if cursor <= 0:
+            return False
+        oldest = cls.objects.aggregate(oldest=Min("txid"))["oldest"]
+        if oldest is None:
+            return False
+        return oldest <= cursor <= cls.get_cursor()
+
+    @classmethod
+    def get_user_version(cls, user) -> int:
+        """Return the latest change id affecting a user catalog."""
+        latest_ids = [
+            cls.objects.filter(user_filter)
+            .order_by("-id")
+            .values_list("id", flat=True)
+            .first()
+            for user_filter in (Q(user__isnull=True), Q(user=user))
+        ]
+        return max(latest_id or 0 for latest_id in latest_ids)
+
+    @classmethod
+    def get_changed_action_ids(cls, user, cursor: int) -> set:
+        """Return ids of actions changed for a user since cursor."""
+        return set(
+            cls.objects.filter(Q(user__isnull=True) | Q(user=user))
+            .filter(txid__gte=cursor)
+            .values_list("action_id", flat=True)
+        )
+
+
+def record_action_changes(action_ids=(), user_action_ids=()):
+    """Log changes for all users of actions, or for (action, user) pairs."""
+    changes = [ActionChange(action_id=action_id) for action_id in action_ids]
+    changes += [
+        ActionChange(action_id=action_id, user_id=user_id)
+        for action_id, user_id in user_action_ids
+    ]
+    if changes:
+        ActionChange.objects.bulk_create(changes, batch_size=1000)
+
+
+@receiver(post_save, sender=Action)
+@receiver(post_delete, sender=Action)
+def record_action_change(sender, instance, **kwargs):
+    record_action_changes(action_ids=[instance.pk])
@@ -1,5 +1,6 @@
 from abc import ABCMeta, abstractmethod
 from django.db import models
+from django.db.models import DEFERRED
 from simple_history.models import HistoricalRecords
 from django.core.exceptions import ValidationError
 from urllib.parse import urlparse
@@ -12,17 +13,74 @@ class ActionData(models.Model, metaclass=AbstractActionData):
     TYPE = None
     history = HistoricalRecords(inherit=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
     def save(self, *args, **kwargs):
         # Avoid new version if nothing changed
-        if self.pk:
-            old = type(self).objects.get(pk=self.pk)
-            if all(
-                getattr(self, field.name) == getattr(old, field.name)
-                for field in self._meta.fields
-                if field.name not in ["updated_at", "id"]
-            ):
-                return
+        if self.pk and not self.has_changed():
+            return
         super().save(*args, **kwargs)
+        deferred_fields = self.get_deferred_fields()
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname not in deferred_fields
+        }
+
+    def refresh_from_db(self, using=None, fields=None):
+        if fields is not None:
+            fields = list(fields)
+        super().refresh_from_db(using=using, fields=fields)
+        # Refreshed fields hold the stored values again.
+        deferred_fields = self.get_deferred_fields()
+        self._loaded_values = {
+            **getattr(self, "_loaded_values", {}),
+            **{
+                field.attname: getattr(self, field.attname)
+                for field in self._meta.concrete_fields
+                if field.attname not in deferred_fields
+                and (
+                    fields is None
+                    or field.name in fields
+                    or field.attname in fields
+                )
+            },
+        }
+
+    def has_changed(self):
+        """Compare fields with the values loaded from the database."""
+        # Deferred fields have not been set since loading, skip them.
+        deferred_fields = self.get_deferred_fields()
+        field_names = [
+            field.attname
+            for field in self._meta.concrete_fields
+            if field.name not in ["updated_at", "id"]
+            and field.attname not in deferred_fields
+        ]
+        loaded_values = getattr(self, "_loaded_values", {})
+        missing_field_names = [
+            field_name
+            for field_name in field_names
+            if loaded_values.get(field_name, DEFERRED) is DEFERRED
+        ]
+        if missing_field_names:
+            stored_values = (
+                type(self)
+                .objects.filter(pk=self.pk)
+                .values(*missing_field_names)
+                .first()
+            )
+            if stored_values is None:
+                return True
+            loaded_values = {**loaded_values, **stored_values}
+        return any(
+            getattr(self, field_name) != loaded_values[field_name]
+            for field_name in field_names
+        )
 
     @property
     def type(self):
@@ -0,0 +1,262 @@
+from django.db import models, transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, pre_delete
+from django.dispatch import receiver
+
+from users.models import Group, Role, User
+
+from .action_change_models import record_action_changes
+from .action_models import Action
+
+
+class ActionEntitlement(models.Model):
+    """Precomputed user to action access.
+
+    One row per (user, action) pair where the user reaches the action through
+    its users, groups, roles or roles groups. Public actions are not indexed
+    since they are granted to everyone.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="action_entitlements",
+    )
+    action = models.ForeignKey(
+        Action,
+        on_delete=models.CASCADE,
+        related_name="entitlements",
+    )
+
+    class Meta:
+        verbose_name = "Action entitlement"
+        verbose_name_plural = "Action entitlements"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "action"], name="unique_action_entitlement"
+            ),
+        ]
+
+
+def get_granted_entitlements(action_ids=None, user_ids=None) -> set:
+    """Return (action_id, user_id) pairs granted by the action relations.
+
+    Both arguments restrict the computation and accept any iterable or
+    queryset of ids. None means no restriction.
+    """
+    user_paths = [
+        (Action.users.through, "user"),
+        (Action.groups.through, "group__user_set"),
+        (Action.roles.through, "role__users"),
+        (Action.roles.through, "role__groups__user_set"),
+    ]
+    querysets = []
+    for through_model, user_path in user_paths:
+        queryset = through_model.objects.filter(
+            **{f"{user_path}__isnull": False}
+        )
+        if action_ids is not None:
+            queryset = queryset.filter(action_id__in=action_ids)
+        if user_ids is not None:
+            queryset = queryset.filter(**{f"{user_path}__in": user_ids})
+        querysets.append(queryset.values_list("action_id", user_path))
+    return set(querysets[0].union(*querysets[1:]))
+
+
+def diff_action_entitlements(action_ids=None, user_ids=None):
+    """Compare stored entitlements with the granted ones.
+
+    Return the missing (action_id, user_id) pairs and a mapping of stale
+    pairs to their entitlement primary key.
+    """
+    granted = get_granted_entitlements(action_ids, user_ids)
+    queryset = ActionEntitlement.objects.all()
+    if action_ids is not None:
+        queryset = queryset.filter(action_id__in=action_ids)
+    if user_ids is not None:
+        queryset = queryset.filter(user_id__in=user_ids)
+    stored = {
+        (action_id, user_id): pk
+        for pk, action_id, user_id in queryset.values_list(
+            "pk", "action_id", "user_id"
+        )
+    }
+    missing = granted - stored.keys()
+    stale = {pair: pk for pair, pk in stored.items() if pair not in granted}
+    return missing, stale
+
+
+def sync_action_entitlements(action_ids=None, user_ids=None):
+    """Reconcile stored entitlements with the action relations.
+
+    The reconciliation is limited to the given actions and/or users, or
+    covers the whole table when both are None. Return the added and removed
+    (action_id, user_id) pairs.
+    """
+    with transaction.atomic():
+        missing, stale = diff_action_entitlements(action_ids, user_ids)
+        if stale:
+            ActionEntitlement.objects.filter(pk__in=stale.values()).delete()
+        if missing:
+            ActionEntitlement.objects.bulk_create(
+                [
+                    ActionEntitlement(action_id=action_id, user_id=user_id)
+                    for action_id, user_id in missing
+                ],
+                batch_size=1000,
+                ignore_conflicts=True,
+            )
+        record_action_changes(user_action_ids=missing | stale.keys())
+    return missing, set(stale)
+
+
+def get_role_action_ids(role_ids):
+    """Return actions linked to the given roles."""
+    return Action.objects.filter(roles__in=role_ids).values("pk")
+
+
+def get_group_action_ids(group_ids):
+    """Return actions linked to the given groups, directly or via roles."""
+    return Action.objects.filter(
+        Q(groups__in=group_ids) | Q(roles__groups__in=group_ids)
+    ).values("pk")
+
+
+def get_role_user_ids(role_ids):
+    """Return users linked to the given roles, directly or via groups."""
+    return User.objects.filter(
+        Q(roles__in=role_ids) | Q(groups__roles__in=role_ids)
+    ).values("pk")
+
+
+def get_group_user_ids(group_ids):
+    """Return members of the given groups."""
+    return User.objects.filter(groups__in=group_ids).values("pk")
+
+
+SYNC_M2M_ACTIONS = ("post_add", "post_remove", "post_clear")
+
+
+def is_entitlement_change(action, pk_set) -> bool:
+    """Return True if a m2m change may alter entitlements."""
+    return action in SYNC_M2M_ACTIONS and (pk_set is None or len(pk_set) > 0)
+
+
+@receiver(m2m_changed, sender=Action.users.through)
+def sync_action_users_entitlements(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not is_entitlement_change(action, pk_set):
+        return
+    if reverse:
+        sync_action_entitlements(action_ids=pk_set, user_ids=[instance.pk])
+    else:
+        sync_action_entitlements(action_ids=[instance.pk], user_ids=pk_set)
+
+
+@receiver(m2m_changed, sender=Action.groups.through)
+def sync_action_groups_entitlements(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not is_entitlement_change(action, pk_set):
+        return
+    if reverse:
+        sync_action_entitlements(
+            action_ids=pk_set, user_ids=get_group_user_ids([instance.pk])
+        )
+    else:
+        sync_action_entitlements(
+            action_ids=[instance.pk],
+            user_ids=get_group_user_ids(pk_set) if pk_set else None,
+        )
+
+
+@receiver(m2m_changed, sender=Action.roles.through)
+def sync_action_roles_entitlements(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not is_entitlement_change(action, pk_set):
+        return
+    if reverse:
+        sync_action_entitlements(
+            action_ids=pk_set, user_ids=get_role_user_ids([instance.pk])
+        )
+    else:
+        sync_action_entitlements(
+            action_ids=[instance.pk],
+            user_ids=get_role_user_ids(pk_set) if pk_set else None,
+        )
+
+
+@receiver(m2m_changed, sender=Role.users.through)
+def sync_role_users_entitlements(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not is_entitlement_change(action, pk_set):
+        return
+    if reverse:
+        sync_action_entitlements(
+            action_ids=get_role_action_ids(pk_set) if pk_set else None,
+            user_ids=[instance.pk],
+        )
+    else:
+        sync_action_entitlements(
+            action_ids=get_role_action_ids([instance.pk]), user_ids=pk_set
+        )
+
+
+@receiver(m2m_changed, sender=Role.groups.through)
+def sync_role_groups_entitlements(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not is_entitlement_change(action, pk_set):
+        return
+    if reverse:
+        sync_action_entitlements(
+            action_ids=get_role_action_ids(pk_set) if pk_set else None,
+            user_ids=get_group_user_ids([instance.pk]),
+        )
+    else:
+        sync_action_entitlements(
+            action_ids=get_role_action_ids([instance.pk]),
+            user_ids=get_group_user_ids(pk_set) if pk_set else None,
+        )
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def sync_user_groups_entitlements(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not is_entitlement_change(action, pk_set):
+        return
+    if reverse:
+        sync_action_entitlements(
+            action_ids=get_group_action_ids([instance.pk]), user_ids=pk_set
+        )
+    else:
+        sync_action_entitlements(
+            action_ids=get_group_action_ids(pk_set) if pk_set else None,
+            user_ids=[instance.pk],
+        )
+
+
+@receiver(pre_delete, sender=Role)
+@receiver(pre_delete, sender=Group)
+def collect_entitlement_actions(sender, instance, **kwargs):
+    # Relations are removed by cascade without m2m_changed signals, so
+    # remember the impacted actions before they are gone.
+    if sender is Role:
+        action_ids = get_role_action_ids([instance.pk])
+    else:
+        action_ids = get_group_action_ids([instance.pk])
+    instance._entitlement_action_ids = list(
+        action_ids.values_list("pk", flat=True).distinct()
+    )
+
+
+@receiver(post_delete, sender=Role)
+@receiver(post_delete, sender=Group)
+def sync_deleted_relation_entitlements(sender, instance, **kwargs):
+    action_ids = getattr(instance, "_entitlement_action_ids", None)
+    if action_ids:
+        sync_action_entitlements(action_ids=action_ids)
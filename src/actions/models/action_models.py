@@ -96,6 +96,14 @@ class Action(models.Model):
     object_id = models.PositiveIntegerField()
     data = GenericForeignKey("content_type", "object_id")
 
+    @property
+    def data_type(self):
+        """Return data type from content type, without loading data."""
+        data_model = ContentType.objects.get_for_id(
+            self.content_type_id
+        ).model_class()
+        return data_model.TYPE
+
     class Meta:
         verbose_name = "Action"
         verbose_name_plural = "Actions"
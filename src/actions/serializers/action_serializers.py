@@ -1,11 +1,16 @@
 import logging
 
-from django.db import transaction
+from django.db import models, transaction
+from django.db.models import prefetch_related_objects
 from rest_framework import serializers
 from simple_history.utils import update_change_reason
 
-from _config.services.storage_utils import generate_presigned_url
+from _config.services.storage_utils.presigned_url_serializers import (
+    PresignedUrlListSerializer,
+    PresignedUrlSerializerMixin,
+)
 from actions.models.action_models import Action, get_thumbnail_base_key
+from files.jobs import is_processed_image_stored
 from users.models import Group, Role, User
 from users.serializers.group_serializers import GroupDetailedSerializer
 from users.serializers.role_serializers import RoleDetailedSerializer
@@ -19,29 +24,64 @@ from .action_data_version_serializers import action_data_serializers
 logger = logging.getLogger("django")
 
 
-class ActionSerializer(serializers.ModelSerializer):
+class ActionListSerializer(PresignedUrlListSerializer):
+    """List serializer for Action model.
+
+    Load actions data with one query per data type, instead of one query
+    per action, when the child serializer needs it. Thumbnail URLs are
+    signed in one batch.
+    """
+
+    def to_representation(self, data):
+        iterable = (
+            data.all() if isinstance(data, models.manager.BaseManager) else data
+        )
+        actions = list(iterable)
+        if self.child.PREFETCH_DATA:
+            prefetch_related_objects(
+                [action for action in actions if isinstance(action, Action)],
+                "data",
+            )
+        return super().to_representation(actions)
+
+
+class ActionSerializer(
+    PresignedUrlSerializerMixin, serializers.ModelSerializer
+):
     """Serializer for Action model."""
 
+    PREFETCH_DATA = False
     data = serializers.SerializerMethodField()
     thumbnail_url = serializers.SerializerMethodField()
 
     def get_data(self, action: Action) -> dict:
         """Return data type."""
-        return {"type": action.data.type}
+        return {"type": action.data_type}
 
-    def get_thumbnail_url(self, action: Action) -> str:
-        """Return project thumbnail url."""
+    def get_thumbnail_key(self, action: Action) -> str:
+        """Return thumbnail storage key."""
         if bool(action.thumbnail):
-            key = (
+            return (
                 action.thumbnail  # If it's an historic record
                 if isinstance(action.thumbnail, str)
                 else action.thumbnail.name
             )
-            return generate_presigned_url(key, self.context["request"])
+        return None
+
+    def get_presigned_keys(self, action: Action) -> list:
+        key = self.get_thumbnail_key(action)
+        return [key] if key else []
+
+    def get_thumbnail_url(self, action: Action) -> str:
+        """Return project thumbnail url."""
+        key = self.get_thumbnail_key(action)
+        if key:
+            return self.get_presigned_url(key)
         return None
 
     class Meta:
         model = Action
+        list_serializer_class = ActionListSerializer
         fields = [
             "id",
             "name",
@@ -101,6 +141,8 @@ class ActionSerializer(serializers.ModelSerializer):
 class ActionPlayableSerializer(ActionSerializer):
     """Serializer for Action model."""
 
+    PREFETCH_DATA = True
+
     def get_data(self, action: Action) -> dict:
         """Return action data."""
         serializer = action_data_serializers.get(action.data.type)
@@ -110,6 +152,7 @@ class ActionPlayableSerializer(ActionSerializer):
 
     class Meta:
         model = Action
+        list_serializer_class = ActionListSerializer
         fields = ActionSerializer.Meta.fields
         read_only_fields = ActionSerializer.Meta.read_only_fields
 
@@ -124,9 +167,8 @@ class ActionDetailedSerializer(ActionPlayableSerializer):
             user_data = None
             if instance.history_user_id:
                 try:
-                    user = User.objects.get(pk=instance.history_user_id)
                     user_data = ShortUserSerializer(
-                        user, context=self.context
+                        instance.history_user, context=self.context
                     ).data
                 except User.DoesNotExist:
                     user_data = None
@@ -156,6 +198,7 @@ class ActionDetailedSerializer(ActionPlayableSerializer):
 
     class Meta:
         model = Action
+        list_serializer_class = ActionListSerializer
         fields = ActionSerializer.Meta.fields + [
             "create_by",
             "users",
@@ -217,6 +260,12 @@ class ActionDetailedSerializer(ActionPlayableSerializer):
                             )
                         }
                     )
+                if new_key != instance.thumbnail.name and not (
+                    is_processed_image_stored(new_key)
+                ):
+                    raise serializers.ValidationError(
+                        {"thumbnail_key": "Thumbnail is not processed yet."}
+                    )
                 instance.thumbnail.name = new_key
             result = serializers.ModelSerializer.update(
                 self, instance, validated_data
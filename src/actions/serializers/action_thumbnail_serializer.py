@@ -1,16 +1,18 @@
 from django.core.exceptions import ValidationError
 from rest_framework import serializers
 
+from files.serializers import ImageUploadField
+
 
 class ActionThumbnailSerializer(serializers.Serializer):
     """Serializer for Action thumbnail."""
     PICTURE_MAX_SIZE_MB = 100
-    thumbnail = serializers.ImageField(required=True) 
+    VALID_FORMATS = ("PNG", "JPEG", "GIF")
+    thumbnail = ImageUploadField(required=True)
 
     def validate_thumbnail(self, value):
         """Validate thumbnail."""
-        valid_formats = ("PNG", "JPEG", "GIF")
-        if value.image.format not in valid_formats:
+        if value.image_format not in self.VALID_FORMATS:
             raise ValidationError({"error": "Invalid thumbnail file type."})
 
         if value.size > self.PICTURE_MAX_SIZE_MB * 1024 * 1024:
@@ -0,0 +1,18 @@
+from rest_framework import serializers
+
+from users.serializers.user_serializers import ShortUserSerializer
+
+
+class ActionVersionSerializer(serializers.Serializer):
+    """Lightweight serializer for Action history records.
+
+    The version number is not stored, it is set on records by the view.
+    """
+
+    id = serializers.IntegerField(source="history_id", read_only=True)
+    number = serializers.IntegerField(read_only=True)
+    user = ShortUserSerializer(source="history_user", read_only=True)
+    date = serializers.DateTimeField(source="history_date", read_only=True)
+    change_reason = serializers.CharField(
+        source="history_change_reason", read_only=True
+    )
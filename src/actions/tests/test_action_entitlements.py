@@ -0,0 +1,139 @@
+from importlib import import_module
+
+import pytest
+from django.apps import apps
+from django.db.models import Q
+
+from actions.models.action_data_models import PythonActionData
+from actions.models.action_entitlement_models import ActionEntitlement
+from actions.models.action_models import Action
+from users.models import Group, Role, User
+
+populate_action_entitlements = import_module(
+    "actions.migrations.0019_actionentitlement"
+).populate_action_entitlements
+
+
+def get_permitted_entitlements() -> set:
+    """Return (action_id, user_id) pairs of the former permission query."""
+    return {
+        (action_id, user.pk)
+        for user in User.objects.all()
+        for action_id in Action.objects.filter(
+            Q(users=user)
+            | Q(groups__user_set=user)
+            | Q(roles__users=user)
+            | Q(roles__groups__user_set=user)
+        )
+        .distinct()
+        .values_list("pk", flat=True)
+    }
+
+
+def get_stored_entitlements() -> set:
+    return set(ActionEntitlement.objects.values_list("action_id", "user_id"))
+
+
+def assert_entitlements_synced():
+    assert get_stored_entitlements() == get_permitted_entitlements()
+
+
+@pytest.fixture
+def objects(db):
+    """Users, groups and roles without relations, and two actions."""
+    return {
+        "users": [
+            User.objects.create(username=f"user{i}", email=f"user{i}@test.com")
+            for i in range(3)
+        ],
+        "groups": [Group.objects.create(name=f"group{i}") for i in range(2)],
+        "roles": [Role.objects.create(name=f"role{i}") for i in range(2)],
+        "actions": [
+            Action.objects.create(
+                name=f"action{i}", data=PythonActionData.objects.create()
+            )
+            for i in range(2)
+        ],
+    }
+
+
+@pytest.fixture
+def linked_objects(objects):
+    """Objects linked so each user reaches action0 through one path."""
+    user0, user1, user2 = objects["users"]
+    group0, group1 = objects["groups"]
+    role0, role1 = objects["roles"]
+    action0, action1 = objects["actions"]
+    action0.users.add(user0)
+    action0.groups.add(group0)
+    group0.user_set.add(user1)
+    action0.roles.add(role0)
+    role0.users.add(user2)
+    action1.roles.add(role1)
+    role1.groups.add(group1)
+    group1.user_set.add(user0)
+    assert_entitlements_synced()
+    return objects
+
+
+# Changes are made from both sides of the relations, except for the action
+# ones: their history tracking only supports changes from the action side.
+RELATION_CHANGES = {
+    "action_users_add": lambda o: o["actions"][1].users.add(o["users"][1]),
+    "action_users_remove": lambda o: o["actions"][0].users.remove(
+        o["users"][0]
+    ),
+    "action_users_clear": lambda o: o["actions"][0].users.clear(),
+    "action_groups_add": lambda o: o["actions"][1].groups.add(o["groups"][0]),
+    "action_groups_remove": lambda o: o["actions"][0].groups.remove(
+        o["groups"][0]
+    ),
+    "action_groups_clear": lambda o: o["actions"][0].groups.clear(),
+    "action_roles_add": lambda o: o["actions"][1].roles.add(o["roles"][0]),
+    "action_roles_remove": lambda o: o["actions"][0].roles.remove(
+        o["roles"][0]
+    ),
+    "action_roles_clear": lambda o: o["actions"][0].roles.clear(),
+    "role_users_add": lambda o: o["roles"][1].users.add(o["users"][1]),
+    "user_roles_add": lambda o: o["users"][1].roles.add(o["roles"][1]),
+    "role_users_remove": lambda o: o["roles"][0].users.remove(o["users"][2]),
+    "user_roles_remove": lambda o: o["users"][2].roles.remove(o["roles"][0]),
+    "role_users_clear": lambda o: o["roles"][0].users.clear(),
+    "user_roles_clear": lambda o: o["users"][2].roles.clear(),
+    "role_groups_add": lambda o: o["roles"][1].groups.add(o["groups"][0]),
+    "group_roles_add": lambda o: o["groups"][0].roles.add(o["roles"][1]),
+    "role_groups_remove": lambda o: o["roles"][1].groups.remove(o["groups"][1]),
+    "group_roles_remove": lambda o: o["groups"][1].roles.remove(o["roles"][1]),
+    "role_groups_clear": lambda o: o["roles"][1].groups.clear(),
+    "group_roles_clear": lambda o: o["groups"][1].roles.clear(),
+    # SCIM adds and removes group members from the group side.
+    "group_users_add": lambda o: o["groups"][1].user_set.add(o["users"][1]),
+    "user_groups_add": lambda o: o["users"][1].groups.add(o["groups"][1]),
+    "group_users_remove": lambda o: o["groups"][1].user_set.remove(
+        o["users"][0]
+    ),
+    "user_groups_remove": lambda o: o["users"][0].groups.remove(o["groups"][1]),
+    "group_users_clear": lambda o: o["groups"][1].user_set.clear(),
+    "user_groups_clear": lambda o: o["users"][0].groups.clear(),
+    "group_users_set": lambda o: o["groups"][1].user_set.set([o["users"][1]]),
+    "role_delete": lambda o: o["roles"][1].delete(),
+    "group_delete": lambda o: o["groups"][1].delete(),
+    "user_delete": lambda o: o["users"][0].delete(),
+    "action_delete": lambda o: o["actions"][0].delete(),
+}
+
+
+@pytest.mark.parametrize(
+    "change", RELATION_CHANGES.values(), ids=RELATION_CHANGES.keys()
+)
+def test_entitlements_follow_relation_changes(linked_objects, change):
+    entitlements = get_stored_entitlements()
+    change(linked_objects)
+    assert get_stored_entitlements() != entitlements
+    assert_entitlements_synced()
+
+
+def test_backfill_matches_permission_query(linked_objects):
+    ActionEntitlement.objects.all().delete()
+    populate_action_entitlements(apps, None)
+    assert_entitlements_synced()
@@ -1,21 +1,30 @@
-import mimetypes
 from http import HTTPMethod
 
 from django.core.exceptions import ValidationError
-from django.core.files.base import ContentFile
-from django.core.files.storage import default_storage
-from django.http import FileResponse, Http404
-from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, JSONParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from _config.parsers import StorageMultiPartParser
 from _config.permissions import IsFileAuthenticated
 from _config.services.storage_utils import generate_presigned_url
+from _config.services.storage_utils.file_response import build_file_response
 from actions.models.action_models import generate_thumbnail_path
 from actions.serializers.action_thumbnail_serializer import (
     ActionThumbnailSerializer,
 )
+from files.direct_uploads import (
+    finalize_direct_upload,
+    initiate_direct_upload,
+)
+from files.jobs import create_image_processing_job
+from files.serializers import (
+    DirectUploadFinalizeSerializer,
+    DirectUploadSerializer,
+    ImageProcessingJobSerializer,
+)
+from files.views import get_image_processing_status
 
 
 class ActionThumbnailMixin:
@@ -37,21 +46,7 @@ class ActionThumbnailMixin:
         if request.file_key and request.file_key != key:
             raise ValidationError("Invalid file key provided.")
 
-        if thumbnail_action.thumbnail.name == key:
-            file_obj = thumbnail_action.thumbnail
-            content_type = (
-                mimetypes.guess_type(thumbnail_action.thumbnail.name)[0]
-                or "application/octet-stream"
-            )
-        else:
-            try:
-                file_obj = default_storage.open(key, "rb")
-            except FileNotFoundError:
-                raise Http404("Thumbnail not found")
-            content_type = (
-                mimetypes.guess_type(key)[0] or "application/octet-stream"
-            )
-        return FileResponse(file_obj, content_type=content_type)
+        return build_file_response(request, key)
 
     @action(
         detail=True,
@@ -59,20 +54,73 @@ class ActionThumbnailMixin:
         name="set_thumbnail",
         url_name="thumbnail",
         url_path="thumbnail",
+        parser_classes=[JSONParser, FormParser, StorageMultiPartParser],
     )
     def set_thumbnail(self, request, pk=None):
-        """Set action thumbnail."""
-        # TODO: Manage unreferenced old thumbnails cleanup
+        """
+        Upload an action thumbnail.
+
+        The thumbnail is resized off-request, the returned key can be set
+        on the action once the job is done.
+        """
         obj = self.get_object()
         serializer = ActionThumbnailSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        thumbnail_file = serializer.validated_data["thumbnail"]
-        key = generate_thumbnail_path(obj, thumbnail_file.name)
-        default_storage.save(key, ContentFile(thumbnail_file.read()))
+        job = create_image_processing_job(
+            serializer.validated_data["thumbnail"],
+            obj,
+            "thumbnail",
+            request.user,
+            attach=False,
+        )
+        return self.get_thumbnail_job_response(request, job)
+
+    @action(
+        detail=True,
+        methods=[HTTPMethod.POST],
+        url_name="thumbnail-upload",
+        url_path="thumbnail/upload",
+    )
+    def initiate_thumbnail_upload(self, request, pk=None):
+        """Start a direct upload of an action thumbnail to the storage."""
+        obj = self.get_object()
+        serializer = DirectUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            initiate_direct_upload(
+                request, obj, "thumbnail", **serializer.validated_data
+            )
+        )
+
+    @action(
+        detail=True,
+        methods=[HTTPMethod.POST],
+        url_name="thumbnail-upload-finalize",
+        url_path="thumbnail/upload/finalize",
+    )
+    def finalize_thumbnail_upload(self, request, pk=None):
+        """Check a directly uploaded thumbnail and queue its processing."""
+        obj = self.get_object()
+        serializer = DirectUploadFinalizeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = finalize_direct_upload(
+            request,
+            serializer.validated_data["token"],
+            obj,
+            "thumbnail",
+            max_size_mb=ActionThumbnailSerializer.PICTURE_MAX_SIZE_MB,
+            formats=ActionThumbnailSerializer.VALID_FORMATS,
+            attach=False,
+        )
+        return self.get_thumbnail_job_response(request, job)
+
+    def get_thumbnail_job_response(self, request, job):
+        """Return the key and URL of a thumbnail being processed."""
         return Response(
             {
-                "url": generate_presigned_url(key, request),
-                "key": key,
+                "url": generate_presigned_url(job.target_key, request),
+                "key": job.target_key,
+                "job": ImageProcessingJobSerializer(job).data,
             },
-            status=status.HTTP_200_OK,
+            status=get_image_processing_status(job),
         )
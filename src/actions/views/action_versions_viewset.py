@@ -0,0 +1,195 @@
+from bisect import bisect_right
+from collections import defaultdict
+from http import HTTPMethod
+
+from django.db.models import Prefetch
+from django.http import Http404
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from actions.models.action_models import Action
+from actions.serializers.action_serializers import ActionDetailedSerializer
+from actions.serializers.action_version_serializers import (
+    ActionVersionSerializer,
+)
+from users.models import Group, Role, User
+
+
+def get_serialized_users():
+    """Return users with the relations read by UserSerializer."""
+    return User.objects.select_related("preferences").prefetch_related("groups")
+
+
+def get_action_versions(action_obj: Action):
+    """Return action versions, oldest first.
+
+    A version is a history record with a change reason.
+    """
+    return (
+        action_obj.history.exclude(history_change_reason__isnull=True)
+        .exclude(history_change_reason="")
+        .select_related("history_user")
+        .order_by("history_date", "history_id")
+    )
+
+
+def get_action_version_snapshots(action_obj: Action, action_versions) -> list:
+    """Return action versions ready to be serialized as full actions.
+
+    Each version gets the action data, users, groups and roles it had at
+    that date. Every kind of snapshot is loaded in one query for all
+    versions.
+    """
+    action_versions = list(
+        action_versions.select_related(
+            "create_by__preferences"
+        ).prefetch_related("create_by__groups")
+    )
+    if not action_versions:
+        return action_versions
+
+    set_action_versions_data(action_obj, action_versions)
+    set_action_versions_relations(action_versions)
+    return action_versions
+
+
+def set_action_versions_data(action_obj: Action, action_versions: list):
+    """Set the action data as it was at each version date."""
+    data_records = list(
+        action_obj.data.history.order_by("history_date", "history_id")
+    )
+    data_dates = [record.history_date for record in data_records]
+    for action_version in action_versions:
+        # Same resolution as history.as_of(): latest record at that date.
+        index = bisect_right(data_dates, action_version.history_date)
+        data_record = data_records[index - 1] if index else None
+        if data_record is None or data_record.history_type == "-":
+            action_version.data = action_obj.data
+        else:
+            action_version.data = data_record.instance
+
+
+def set_action_versions_relations(action_versions: list):
+    """Set the users, groups and roles linked to each version."""
+    history_model = Action.history.model
+    history_ids = [
+        action_version.history_id for action_version in action_versions
+    ]
+    relations = {
+        "users": ("user_id", get_serialized_users()),
+        "groups": (
+            "group_id",
+            Group.objects.prefetch_related(
+                Prefetch("user_set", queryset=get_serialized_users())
+            ),
+        ),
+        "roles": (
+            "role_id",
+            Role.objects.prefetch_related(
+                Prefetch("users", queryset=get_serialized_users()),
+                "groups__user_set",
+                "actions",
+            ),
+        ),
+    }
+    for field_name, (related_id_field, queryset) in relations.items():
+        snapshots = defaultdict(list)
+        for history_id, related_id in (
+            getattr(history_model, field_name)
+            .model.objects.filter(history_id__in=history_ids)
+            .values_list("history_id", related_id_field)
+            .order_by("pk")
+        ):
+            snapshots[history_id].append(related_id)
+        related_objects = queryset.in_bulk(
+            {
+                related_id
+                for related_ids in snapshots.values()
+                for related_id in related_ids
+            }
+        )
+        for action_version in action_versions:
+            setattr(
+                action_version,
+                field_name,
+                [
+                    related_objects[related_id]
+                    for related_id in snapshots[action_version.history_id]
+                    if related_id in related_objects
+                ],
+            )
+
+
+class ActionVersionsMixin:
+    @action(
+        detail=True,
+        methods=[HTTPMethod.GET],
+        permission_classes=[IsAuthenticated],
+    )
+    def versions(self, request, pk=None):
+        """Get action versions, newest first.
+
+        With paginated=true, only versions metadata is returned, one page
+        at a time. Full versions are then served by the version route.
+        """
+        action_obj = self.get_object()
+        if request.query_params.get("paginated") == "true":
+            return self.get_paginated_versions(action_obj)
+
+        versions = []
+        for number, action_version in enumerate(
+            get_action_version_snapshots(
+                action_obj, get_action_versions(action_obj)
+            ),
+            start=1,
+        ):
+            data = ActionDetailedSerializer(
+                action_version, context={"request": request}
+            ).data
+            if data.get("history"):
+                data["history"]["number"] = number
+            versions.append(data)
+        versions.reverse()
+        return Response(versions)
+
+    def get_paginated_versions(self, action_obj: Action):
+        """Return a page of versions metadata, newest first."""
+        action_versions = get_action_versions(action_obj).reverse()
+        page = self.paginate_queryset(action_versions)
+        # Numbers count versions from the oldest one.
+        number = self.paginator.page.paginator.count
+        number -= self.paginator.page.start_index() - 1
+        for action_version in page:
+            action_version.number = number
+            number -= 1
+        serializer = ActionVersionSerializer(
+            page, many=True, context={"request": self.request}
+        )
+        return self.get_paginated_response(serializer.data)
+
+    @action(
+        detail=True,
+        methods=[HTTPMethod.GET],
+        url_name="version",
+        permission_classes=[IsAuthenticated],
+        url_path=r"versions/(?P<number>\d+)",
+    )
+    def version(self, request, pk=None, number=None):
+        """Get an action version by number."""
+        action_obj = self.get_object()
+        number = int(number)
+        if number < 1:
+            raise Http404("Version not found")
+        action_versions = get_action_versions(action_obj)[number - 1 : number]
+        action_versions = get_action_version_snapshots(
+            action_obj, action_versions
+        )
+        if not action_versions:
+            raise Http404("Version not found")
+        data = ActionDetailedSerializer(
+            action_versions[0], context={"request": request}
+        ).data
+        if data.get("history"):
+            data["history"]["number"] = number
+        return Response(data)
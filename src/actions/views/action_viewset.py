@@ -10,17 +10,25 @@ from users.serializers.group_serializers import GroupDetailedSerializer
 from users.serializers.role_serializers import RoleDetailedSerializer
 from rest_framework.filters import OrderingFilter, SearchFilter
 from actions.models.action_models import Action
+from actions.models.action_change_models import ActionChange
+from actions.models.action_entitlement_models import ActionEntitlement
 from users.models import User, Group, Role
-from actions.serializers.action_data_version_serializers import action_data_serializers
 from actions.serializers.action_serializers import (
     ActionSerializer,
     ActionDetailedSerializer,
     ActionPlayableSerializer,
 )
 from system.models import SystemInfo
+from _config.services.conditional_get import (
+    build_etag,
+    get_not_modified_response,
+    set_etag,
+)
+from _config.services.storage_utils import get_presigned_url_epoch
 from rest_framework.pagination import PageNumberPagination
 from workspaces.models import Workspace
 from .action_thumbnail_viewset import ActionThumbnailMixin
+from .action_versions_viewset import ActionVersionsMixin
 
 
 class ActionPagination(PageNumberPagination):
@@ -29,7 +37,9 @@ class ActionPagination(PageNumberPagination):
     max_page_size = 1000
 
 
-class ActionViewSet(viewsets.ModelViewSet, ActionThumbnailMixin):
+class ActionViewSet(
+    viewsets.ModelViewSet, ActionThumbnailMixin, ActionVersionsMixin
+):
     model = Action
     permission_classes = [IsAuthenticated, IsActionManager, IsActionWorkspaceMember]
     filter_backends = [OrderingFilter, SearchFilter]
@@ -77,11 +87,61 @@ class ActionViewSet(viewsets.ModelViewSet, ActionThumbnailMixin):
 
     @action(methods=["get"], detail=False, permission_classes=[IsAuthenticated])
     def mine(self, request):
+        etag = build_etag(
+            "actions-mine",
+            request.user.pk,
+            ActionChange.get_user_version(request.user),
+            get_presigned_url_epoch(),
+            request.META.get("QUERY_STRING", ""),
+        )
+        not_modified_response = get_not_modified_response(request, etag)
+        if not_modified_response:
+            return not_modified_response
+
+        since = request.query_params.get("since")
+        if since is not None:
+            response = self.get_user_action_changes(request, since)
+        else:
+            actions = self.get_user_active_actions(request.user)
+            response = Response(
+                ActionPlayableSerializer(
+                    actions, many=True, context={"request": request}
+                ).data
+            )
+        return set_etag(response, etag)
+
+    def get_user_action_changes(self, request, since):
+        """Return user actions changed since a catalog cursor.
+
+        Actions no longer visible to the user (access revoked, deactivated
+        or deleted) are returned as removed ids. If the cursor is unknown or
+        too old, the whole catalog is returned with full set to true.
+        """
+        if not since.isdigit():
+            return Response(
+                {"error": "since query param must be a positive integer."},
+                status=400,
+            )
+        since = int(since)
+        cursor = ActionChange.get_cursor()
         actions = self.get_user_active_actions(request.user)
+        full = not ActionChange.is_cursor_valid(since)
+        removed = []
+        if not full:
+            changed_ids = ActionChange.get_changed_action_ids(
+                request.user, since
+            )
+            actions = list(actions.filter(pk__in=changed_ids))
+            removed = sorted(changed_ids - {action.pk for action in actions})
         return Response(
-            ActionPlayableSerializer(
-                actions, many=True, context={"request": request}
-            ).data
+            {
+                "cursor": cursor,
+                "full": full,
+                "actions": ActionPlayableSerializer(
+                    actions, many=True, context={"request": request}
+                ).data,
+                "removed": removed,
+            }
         )
 
     @action(methods=["get"], detail=False, permission_classes=[IsAuthenticated])
@@ -121,67 +181,16 @@ class ActionViewSet(viewsets.ModelViewSet, ActionThumbnailMixin):
             }
         )
 
-    @action(methods=["get"], detail=True, permission_classes=[IsAuthenticated])
-    def versions(self, request, pk=None):
-        action_obj = self.get_object()
-        action_versions = action_obj.history.order_by("history_date")
-
-        versions = []
-        version_count = 0
-        for action_version in action_versions:
-            action_version.data = action_obj.data.history.as_of(
-                action_version.history_date
-            )
-            if not action_version.history_change_reason:
-                continue
-            version_count += 1
-
-            users = []
-            for user in action_version.users.all():
-                try:
-                    users.append(User.objects.get(pk=user.user_id))
-                except User.DoesNotExist:
-                    pass
-            action_version.users = users
-
-            groups = []
-            for group in action_version.groups.all():
-                try:
-                    groups.append(Group.objects.get(pk=group.group_id))
-                except Group.DoesNotExist:
-                    pass
-            action_version.groups = groups
-
-            roles = []
-            for role in action_version.roles.all():
-                try:
-                    roles.append(Role.objects.get(pk=role.role_id))
-                except Role.DoesNotExist:
-                    pass
-            action_version.roles = roles
-            serializer = ActionDetailedSerializer(
-                action_version, context={"request": request}
-            )
-            data = serializer.data
-            if data.get("history"):
-                data["history"]["number"] = version_count
-            versions.append(data)
-        versions.reverse()
-        return Response(versions)
-
     def get_user_active_actions(self, user):
+        # Actions linked to user directly, via group, role or role group
+        user_entitlements = ActionEntitlement.objects.filter(
+            user=user, action_id=OuterRef("pk")
+        )
         queryset = (
             Action.objects.filter(is_active=True)
             .filter(
-                Q(users=user)  # Actions linked to user
-                | Q(groups__user_set=user)  # Actions linked to user via group
-                | Q(roles__users=user)  # Actions linked to user via role
-                | Q(
-                    roles__groups__user_set=user
-                )  # Actions linked to user via role group
+                Exists(user_entitlements)
                 | Q(is_public=True)  # Actions marked as public
             )
-            .distinct()
-            .prefetch_related("users", "groups", "roles__users", "roles__groups")
         )
         return self.filter_queryset(queryset)
@@ -1,7 +1,7 @@
 import logging
 
 from django.conf import settings
-from django.contrib.auth import authenticate
+from django.contrib.auth import authenticate, get_user_model
 from rest_framework import serializers, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -9,11 +9,13 @@ from rest_framework.response import Response
 from rest_framework_simplejwt import exceptions as jwt_exceptions
 from rest_framework_simplejwt import serializers as jwt_serializers
 from rest_framework_simplejwt import views as jwt_views
+from rest_framework_simplejwt.settings import api_settings
 
 from .jwt_utils import (
-    BROWSER_USER_AGENTS,
+    add_user_claims,
     backlist_tokens,
     get_tokens_for_user,
+    is_cookie_auth_request,
     set_jwt_tokens,
 )
 
@@ -73,10 +75,7 @@ class LogoutSerializer(serializers.Serializer):
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def logout(request):
-    if (
-        settings.SIMPLE_JWT.get("AUTH_COOKIE_ENABLED", False)
-        and request.user_agent.browser.family in BROWSER_USER_AGENTS
-    ):
+    if is_cookie_auth_request(request):
         refresh_token = request.COOKIES.get(
             settings.SIMPLE_JWT["AUTH_COOKIE_REFRESH_NAME"]
         )
@@ -118,12 +117,32 @@ class CookieTokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
                     settings.SIMPLE_JWT["AUTH_COOKIE_REFRESH_NAME"]
                 )
             logger.warning(refresh_token)
-        if attrs.get("refresh"):
-            return super().validate(attrs)
-        else:
+        if not attrs.get("refresh"):
             raise serializers.ValidationError(
                 {"refresh": "This field is required."}
             )
+        # Same checks as TokenRefreshSerializer, the access token then gets
+        # the claims of the user loaded for them. Tokens are not rotated.
+        refresh = self.token_class(attrs["refresh"])
+        user = (
+            get_user_model()
+            .objects.filter(
+                **{
+                    api_settings.USER_ID_FIELD: refresh.payload.get(
+                        api_settings.USER_ID_CLAIM
+                    )
+                }
+            )
+            .first()
+        )
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise jwt_exceptions.AuthenticationFailed(
+                self.error_messages["no_active_account"],
+                "no_active_account",
+            )
+        access = refresh.access_token
+        add_user_claims(access, user)
+        return {"access": str(access)}
 
 
 class CookieTokenRefreshView(jwt_views.TokenRefreshView):
@@ -133,10 +152,7 @@ class CookieTokenRefreshView(jwt_views.TokenRefreshView):
         if response.data.get("access"):
             set_jwt_tokens(response.data, response, request, with_refresh=False)
         response = super().finalize_response(request, response, *args, **kwargs)
-        if (
-            request.user_agent.browser.family in BROWSER_USER_AGENTS
-            and settings.SIMPLE_JWT.get("AUTH_COOKIE_ENABLED", False)
-        ):
+        if is_cookie_auth_request(request):
             response.data.pop("access", None)
         return response
 
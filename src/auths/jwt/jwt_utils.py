@@ -1,6 +1,9 @@
 from datetime import timedelta
+from functools import lru_cache
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
 from django.utils import timezone
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import (
@@ -11,7 +14,9 @@ from rest_framework_simplejwt.token_blacklist.models import (
     BlacklistedToken,
     OutstandingToken,
 )
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
+from user_agents import parse as parse_user_agent
 
 BROWSER_USER_AGENTS = [
     "Brave",
@@ -26,14 +31,33 @@ BROWSER_USER_AGENTS = [
     "Vivaldi",
 ]
 
+# User fields and properties embedded in access tokens, for the stateless
+# authentication.
+USER_TOKEN_CLAIMS = ("system_role", "is_active", "is_superuser_group_member")
+
+
+def is_cookie_auth_request(request) -> bool:
+    """Return whether the JWT tokens of a request are sent in cookies."""
+    simple_jwt_settings = getattr(settings, "SIMPLE_JWT", {})
+    if not simple_jwt_settings.get("AUTH_COOKIE_ENABLED", False):
+        return False
+    return is_browser_user_agent(request.headers.get("User-Agent", ""))
+
+
+@lru_cache(maxsize=1024)
+def is_browser_user_agent(user_agent: str) -> bool:
+    """
+    Return whether a User-Agent is the one of a browser.
+
+    Cached, as parsing the User-Agent runs a long list of regexes.
+    """
+    return parse_user_agent(user_agent).browser.family in BROWSER_USER_AGENTS
+
 
 class JwtCookiesAuthentication(JWTAuthentication):
     def authenticate(self, request):
         simple_jwt_settings = getattr(settings, "SIMPLE_JWT", {})
-        if (
-            request.user_agent.browser.family not in BROWSER_USER_AGENTS
-            or not simple_jwt_settings.get("AUTH_COOKIE_ENABLED", False)
-        ):
+        if not is_cookie_auth_request(request):
             return super().authenticate(request)
 
         raw_token = request.COOKIES.get(simple_jwt_settings["AUTH_COOKIE_NAME"])
@@ -46,13 +70,58 @@ class JwtCookiesAuthentication(JWTAuthentication):
         except (InvalidToken, AuthenticationFailed):
             return None
 
+    def get_user(self, validated_token):
+        if not settings.JWT_STATELESS_AUTHENTICATION or not all(
+            claim in validated_token for claim in USER_TOKEN_CLAIMS
+        ):
+            return super().get_user(validated_token)
+        if not validated_token["is_active"]:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return get_token_user(validated_token)
+
+
+def add_user_claims(token, user):
+    """Embed the user claims of the stateless authentication in a token."""
+    for claim in USER_TOKEN_CLAIMS:
+        token[claim] = getattr(user, claim)
+
+
+def get_token_user(validated_token):
+    """
+    Return a user built from the claims of an access token.
+
+    Other fields are deferred: the first access to one of them loads them
+    all from the database.
+    """
+    User = get_user_model()
+    id_field = User._meta.get_field(api_settings.USER_ID_FIELD)
+    values = {
+        id_field.attname: id_field.to_python(
+            validated_token[api_settings.USER_ID_CLAIM]
+        ),
+        "system_role": validated_token["system_role"],
+        "is_active": validated_token["is_active"],
+    }
+    # from_db() expects the values in the order of the model fields.
+    field_names = [
+        field.attname
+        for field in User._meta.concrete_fields
+        if field.attname in values
+    ]
+    user = User.from_db(
+        User.objects.db,
+        field_names,
+        [values[field_name] for field_name in field_names],
+    )
+    user.__dict__["is_superuser_group_member"] = validated_token[
+        "is_superuser_group_member"
+    ]
+    return user
+
 
 def set_jwt_tokens(tokens, response, request, with_refresh=True):
     simple_jwt_settings = getattr(settings, "SIMPLE_JWT", {})
-    if (
-        simple_jwt_settings.get("AUTH_COOKIE_ENABLED", False)
-        and request.user_agent.browser.family in BROWSER_USER_AGENTS
-    ):
+    if is_cookie_auth_request(request):
         cookies_config_base = {
             "secure": simple_jwt_settings.get("AUTH_COOKIE_SECURE", True),
             "httponly": simple_jwt_settings.get("AUTH_COOKIE_HTTP_ONLY", True),
@@ -90,19 +159,57 @@ def set_jwt_tokens(tokens, response, request, with_refresh=True):
 
 def get_tokens_for_user(user):
     refresh = RefreshToken.for_user(user)
+    access = refresh.access_token
+    add_user_claims(access, user)
     return {
         "refresh": str(refresh),
-        "access": str(refresh.access_token),
+        "access": str(access),
     }
 
 
 def backlist_user_tokens(user):
     """Blacklist all tokens for a user."""
-    for token in OutstandingToken.objects.filter(user=user):
-        BlacklistedToken.objects.get_or_create(token=token)
+    return backlist_users_tokens([user])
+
+
+def backlist_users_tokens(users):
+    """Blacklist the unexpired tokens of users, e.g. deactivated ones."""
+    return blacklist_outstanding_tokens(
+        OutstandingToken.objects.filter(
+            user__in=users, expires_at__gt=timezone.now()
+        )
+    )
 
 
 def backlist_tokens(tokens: list[str]):
     """Blacklist all tokens in the provided list."""
-    for token in OutstandingToken.objects.filter(token__in=tokens):
-        BlacklistedToken.objects.get_or_create(token=token)
+    return blacklist_outstanding_tokens(
+        OutstandingToken.objects.filter(token__in=tokens)
+    )
+
+
+def blacklist_outstanding_tokens(outstanding_tokens) -> int:
+    """
+    Blacklist a queryset of outstanding tokens in a single INSERT ... SELECT.
+
+    Already blacklisted tokens are skipped. Return the number of tokens
+    blacklisted.
+    """
+    connection = connections[outstanding_tokens.db]
+    quote_name = connection.ops.quote_name
+    query, params = (
+        outstanding_tokens.order_by().values("pk").query.sql_with_params()
+    )
+    # The WHERE clause lets SQLite parse the ON CONFLICT clause.
+    sql = (
+        f"INSERT INTO {quote_name(BlacklistedToken._meta.db_table)} "
+        f"({quote_name('token_id')}, {quote_name('blacklisted_at')}) "
+        f"SELECT {quote_name('id')}, %s FROM ({query}) AS tokens WHERE true "
+        f"ON CONFLICT ({quote_name('token_id')}) DO NOTHING"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            sql,
+            (connection.ops.adapt_datetimefield_value(timezone.now()), *params),
+        )
+        return cursor.rowcount
@@ -0,0 +1,70 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired outstanding and blacklisted JWT tokens in batches, "
+        "so it can run while the API is in use."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of tokens deleted per transaction (default: 1000).",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.1,
+            help="Seconds to wait between batches (default: 0.1).",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] <= 0:
+            raise CommandError("--batch-size must be greater than 0.")
+        if options["sleep"] < 0:
+            raise CommandError("--sleep must not be negative.")
+        start = time.monotonic()
+        # Tokens expiring while pruning are left to the next run.
+        now = timezone.now()
+        outstanding_count = blacklisted_count = 0
+        while True:
+            token_ids = list(
+                OutstandingToken.objects.filter(expires_at__lte=now)
+                .order_by("id")
+                .values_list("id", flat=True)[: options["batch_size"] + 1]
+            )
+            if not token_ids:
+                break
+            with transaction.atomic():
+                # Blacklisted tokens are deleted in cascade.
+                _, deleted = OutstandingToken.objects.filter(
+                    id__in=token_ids[: options["batch_size"]]
+                ).delete()
+            outstanding_count += deleted.get(OutstandingToken._meta.label, 0)
+            blacklisted_count += deleted.get(BlacklistedToken._meta.label, 0)
+            if options["verbosity"] > 1:
+                self.stdout.write(
+                    f"{outstanding_count} expired tokens deleted so far."
+                )
+            # One more token is fetched to know if another batch follows.
+            if len(token_ids) <= options["batch_size"]:
+                break
+            time.sleep(options["sleep"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{outstanding_count} expired outstanding tokens and "
+                f"{blacklisted_count} blacklisted tokens deleted in "
+                f"{time.monotonic() - start:.1f}s."
+            )
+        )
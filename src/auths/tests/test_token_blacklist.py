@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from auths.jwt.jwt_utils import (
+    backlist_tokens,
+    backlist_users_tokens,
+    get_tokens_for_user,
+)
+from users.models import User
+
+
+@pytest.fixture
+def users(db):
+    return [
+        User.objects.create(username=f"user{i}", email=f"user{i}@test.com")
+        for i in range(2)
+    ]
+
+
+def get_blacklisted_users() -> list:
+    return list(
+        BlacklistedToken.objects.order_by("token__user")
+        .values_list("token__user", flat=True)
+        .distinct()
+    )
+
+
+def test_users_tokens_are_blacklisted_once(users):
+    for user in users:
+        get_tokens_for_user(user)
+        get_tokens_for_user(user)
+    assert backlist_users_tokens([users[0]]) == 2
+    # Already blacklisted tokens are skipped by ON CONFLICT.
+    assert backlist_users_tokens(users) == 2
+    assert backlist_users_tokens(users) == 0
+    assert BlacklistedToken.objects.count() == 4
+
+
+def test_expired_tokens_are_not_blacklisted(users):
+    get_tokens_for_user(users[0])
+    OutstandingToken.objects.update(
+        expires_at=timezone.now() - timedelta(seconds=1)
+    )
+    assert backlist_users_tokens(users) == 0
+    assert not BlacklistedToken.objects.exists()
+
+
+def test_tokens_are_blacklisted_by_value(users):
+    refresh_token = get_tokens_for_user(users[1])["refresh"]
+    get_tokens_for_user(users[0])
+    assert backlist_tokens([refresh_token]) == 1
+    assert get_blacklisted_users() == [users[1].pk]
+
+
+def test_deactivation_blacklists_tokens_on_commit(
+    users, django_capture_on_commit_callbacks
+):
+    get_tokens_for_user(users[0])
+    users[0].is_active = False
+    with django_capture_on_commit_callbacks(execute=True):
+        users[0].save(update_fields=["username"])
+    assert not BlacklistedToken.objects.exists()
+    with django_capture_on_commit_callbacks(execute=True):
+        users[0].save()
+    assert get_blacklisted_users() == [users[0].pk]
@@ -0,0 +1,117 @@
+import io
+import os
+import uuid
+
+from django.contrib.contenttypes.models import ContentType
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from rest_framework.exceptions import PermissionDenied, ValidationError
+
+from _config.services.storage_utils import generate_presigned_upload_url
+from _config.services.storage_utils.presigned_url import (
+    get_presigned_url_lifetime,
+)
+from _config.services.storage_utils.upload_handler import (
+    UPLOADS_BASE_KEY,
+    read_stored_file_head,
+)
+
+from .image_processing import get_image_format
+from .jobs import create_stored_image_processing_job
+from .models import ImageProcessingJob
+
+
+def initiate_direct_upload(
+    request, instance, field_name: str, filename: str, content_type: str
+) -> dict:
+    """
+    Return where and how the client uploads an image for a field.
+
+    The client PUTs the file to the returned URL, straight to the storage
+    (or to the local upload view), then calls the finalize endpoint with the
+    returned token.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    key = UPLOADS_BASE_KEY + default_storage.get_valid_name(
+        f"{uuid.uuid4().hex}{ext}"
+    )
+    token = signing.dumps(
+        {
+            "file": key,
+            "user": request.user.id,
+            "target": get_upload_target(instance, field_name),
+        },
+        salt="direct-upload-token",
+    )
+    return {
+        "url": generate_presigned_upload_url(key, content_type, request),
+        "method": "PUT",
+        "headers": {"Content-Type": content_type},
+        "key": key,
+        "token": token,
+        "expires_in": get_presigned_url_lifetime(),
+    }
+
+
+def finalize_direct_upload(
+    request,
+    token: str,
+    instance,
+    field_name: str,
+    max_size_mb: int,
+    formats: tuple = None,
+    attach: bool = True,
+) -> ImageProcessingJob:
+    """
+    Check an image uploaded to the storage and queue its processing.
+
+    Only the size and the image header are read from the storage. Invalid
+    files are deleted.
+    """
+    try:
+        data = signing.loads(
+            token,
+            salt="direct-upload-token",
+            max_age=get_presigned_url_lifetime(),
+        )
+    except signing.BadSignature:
+        raise ValidationError({"token": "Invalid or expired token."})
+    if data["user"] != request.user.id or data["target"] != (
+        get_upload_target(instance, field_name)
+    ):
+        raise PermissionDenied("Token issued for another upload.")
+
+    key = data["file"]
+    if ImageProcessingJob.objects.filter(source_key=key).exists():
+        raise ValidationError({"token": "Upload already finalized."})
+    if not default_storage.exists(key):
+        raise ValidationError({"token": "File not uploaded."})
+    try:
+        if default_storage.size(key) > max_size_mb * 1024 * 1024:
+            raise ValidationError(
+                f"Image size must be less than {max_size_mb}Mo."
+            )
+        image_format = get_image_format(io.BytesIO(read_stored_file_head(key)))
+        if image_format is None or (formats and image_format not in formats):
+            raise ValidationError("Invalid image file type.")
+    except ValidationError:
+        default_storage.delete(key)
+        raise
+    try:
+        with transaction.atomic():
+            return create_stored_image_processing_job(
+                key, instance, field_name, request.user, attach
+            )
+    except IntegrityError:
+        # Finalized concurrently, jobs are unique per source key.
+        raise ValidationError({"token": "Upload already finalized."})
+
+
+def get_upload_target(instance, field_name: str) -> list:
+    """Return the field an upload token is issued for."""
+    return [
+        ContentType.objects.get_for_model(instance).id,
+        instance.pk,
+        field_name,
+    ]
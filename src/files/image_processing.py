@@ -0,0 +1,108 @@
+"""
+Image decoding and resizing, run in the image processing pool.
+
+This module must not depend on Django: it is imported by the spawned pool
+processes, which do not set Django up.
+"""
+
+import io
+
+from PIL import ExifTags, Image, ImageOps
+
+# EXIF orientations swapping the width and the height.
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+# Encoder options by format. WebP is lossy, photos are a fraction of the
+# PNG size.
+SAVE_OPTIONS = {"WEBP": {"quality": 80, "method": 4}}
+
+
+def get_image_format(file):
+    """
+    Return the format of an image file, or None if it is not an image.
+
+    Only the header is read, the image is not decoded.
+    """
+    try:
+        file.seek(0)
+        with Image.open(file) as image:
+            return image.format
+    except (OSError, Image.DecompressionBombError):
+        return None
+    finally:
+        file.seek(0)
+
+
+def process_image_variants(
+    data: bytes, size, crop: bool, image_format: str = None, variants=()
+) -> list:
+    """
+    Return an image resized to fit size, or to fill it if crop is set, then
+    its variants.
+
+    variants is a list of (size, format), resized the same way but never
+    upscaled past the image size. The image format is kept if none is set.
+    The image is decoded once. JPEG images are decoded at the smallest
+    scale still larger than all sizes.
+    """
+    image = Image.open(io.BytesIO(data))
+    image_format = image_format or image.format
+    if image.format == "JPEG":
+        orientation = image.getexif().get(ExifTags.Base.Orientation)
+        sizes = [size, *(variant_size for variant_size, _ in variants)]
+        draft_size = (
+            max(width for width, _ in sizes),
+            max(height for _, height in sizes),
+        )
+        if orientation in TRANSPOSED_ORIENTATIONS:
+            draft_size = draft_size[::-1]
+        image.draft("RGB", draft_size)
+    image = ImageOps.exif_transpose(image)
+
+    outputs = [encode_resized_image(image, size, crop, image_format)]
+    for variant_size, variant_format in variants:
+        if crop:
+            variant_size = fit_size(variant_size, image.size)
+        outputs.append(
+            encode_resized_image(image, variant_size, crop, variant_format)
+        )
+    return outputs
+
+
+def encode_resized_image(image, size, crop: bool, image_format: str) -> bytes:
+    """Return an encoded copy of a decoded image, resized."""
+    image = convert_mode_for_format(image, image_format)
+    if crop:
+        image = ImageOps.fit(
+            image, size, Image.Resampling.LANCZOS, centering=(0.5, 0.5)
+        )
+    else:
+        image = image.copy()
+        image.thumbnail(size, Image.Resampling.LANCZOS)
+
+    output = io.BytesIO()
+    image.save(
+        output,
+        format=image_format,
+        **SAVE_OPTIONS.get(image_format.upper(), {}),
+    )
+    return output.getvalue()
+
+
+def fit_size(size, max_size):
+    """Return size scaled down to fit max_size, keeping its aspect ratio."""
+    scale = min(max_size[0] / size[0], max_size[1] / size[1], 1)
+    return (max(round(size[0] * scale), 1), max(round(size[1] * scale), 1))
+
+
+def convert_mode_for_format(image, image_format: str):
+    """Return the image in a mode the output format can store."""
+    if image_format.upper() in ("JPEG", "JPG"):
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGBA", image.size, (255, 255, 255, 255))
+            image = Image.alpha_composite(background, image)
+        return image.convert("RGB") if image.mode != "RGB" else image
+    if image.mode not in ("RGB", "RGBA"):
+        return image.convert("RGBA")
+    return image
@@ -0,0 +1,269 @@
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.utils import timezone
+from PIL import Image
+
+from _config.services.storage_utils.upload_handler import StoredUploadedFile
+
+from .image_processing import process_image_variants
+from .models import ImageProcessingJob, StorageDeletion
+from .variants import get_variant_key, get_variants
+
+logger = logging.getLogger(__name__)
+
+ORIGINALS_BASE_KEY = "v1/image-processing/originals/"
+
+# (pid, thread pool, process pool), see get_image_processing_pools().
+_pools = None
+_pools_lock = threading.Lock()
+
+
+class ImageProcessingError(Exception):
+    """Error reported to the client in the job status."""
+
+
+def create_image_processing_job(
+    upload, instance, field_name: str, user, attach: bool = True
+) -> ImageProcessingJob:
+    """
+    Store an uploaded image and queue its processing for an image field.
+
+    Files streamed to the storage by StorageUploadHandler are used as is.
+    The key of the processed image is known at once. If attach is set, it
+    replaces the field value once processed. With IMAGE_PROCESSING_WORKERS
+    set to 0, the image is processed before returning.
+    """
+    if isinstance(upload, StoredUploadedFile):
+        source_key = upload.claim_storage_key()
+    else:
+        ext = os.path.splitext(upload.name)[1].lower()
+        source_key = default_storage.save(
+            f"{ORIGINALS_BASE_KEY}{uuid.uuid4().hex}{ext}", upload
+        )
+    return create_stored_image_processing_job(
+        source_key, instance, field_name, user, attach
+    )
+
+
+def create_stored_image_processing_job(
+    source_key: str, instance, field_name: str, user, attach: bool = True
+) -> ImageProcessingJob:
+    """
+    Queue the processing of an image already stored for an image field.
+
+    The stored image is deleted once processed.
+    """
+    field = instance._meta.get_field(field_name)
+    target_name = (
+        f"image.{field.force_format.lower()}"
+        if field.force_format
+        else os.path.basename(source_key)
+    )
+    job = ImageProcessingJob.objects.create(
+        source_key=source_key,
+        target_key=field.generate_filename(instance, target_name),
+        content_type=ContentType.objects.get_for_model(instance),
+        object_id=instance.pk,
+        field_name=field_name,
+        attach=attach,
+        create_by=user,
+    )
+    if settings.IMAGE_PROCESSING_WORKERS > 0:
+        transaction.on_commit(lambda: submit_image_processing_job(job.pk))
+    else:
+        run_image_processing_job(job.pk)
+        job.refresh_from_db()
+    return job
+
+
+def is_processed_image_stored(key: str) -> bool:
+    """
+    Return whether an image key can be set on an image field.
+
+    Keys of unfinished or failed jobs point at no stored image yet.
+    """
+    return ImageProcessingJob.objects.filter(
+        target_key=key, status=ImageProcessingJob.Status.DONE
+    ).exists() or default_storage.exists(key)
+
+
+def submit_image_processing_job(job_id: int):
+    """Queue a job in the image processing pool."""
+    thread_pool, _ = get_image_processing_pools()
+    thread_pool.submit(run_queued_image_processing_job, job_id)
+
+
+def run_queued_image_processing_job(job_id: int):
+    """Run a job from a pool thread, which has its own DB connections."""
+    try:
+        run_image_processing_job(job_id)
+    finally:
+        connections.close_all()
+
+
+def run_image_processing_job(job_id: int):
+    """Process the image of a pending job, then attach it if requested."""
+    started = ImageProcessingJob.objects.filter(
+        pk=job_id, status=ImageProcessingJob.Status.PENDING
+    ).update(
+        status=ImageProcessingJob.Status.PROCESSING,
+        last_update=timezone.now(),
+    )
+    if not started:
+        return
+    job = ImageProcessingJob.objects.select_related("content_type").get(
+        pk=job_id
+    )
+    try:
+        if job.attach and job.is_superseded():
+            raise ImageProcessingError("Superseded by a newer upload.")
+        field = job.get_field()
+        with default_storage.open(job.source_key, "rb") as source:
+            data = source.read()
+        variants = get_variants(field)
+        image, *variant_images = resize_image(
+            data, field.size, bool(field.crop), field.force_format, variants
+        )
+        job.target_key = default_storage.save(
+            job.target_key, ContentFile(image)
+        )
+        # Variants are stored before the image is attached, so attached
+        # images always have their variants.
+        for (size, image_format), variant_image in zip(
+            variants, variant_images
+        ):
+            default_storage.save(
+                get_variant_key(job.target_key, size[0], image_format),
+                ContentFile(variant_image),
+            )
+        if job.attach:
+            instance = job.target
+            if instance is None:
+                raise ImageProcessingError("Target no longer exists.")
+            StorageDeletion.enqueue(getattr(instance, job.field_name).name)
+            setattr(instance, job.field_name, job.target_key)
+            instance.save(update_fields=[job.field_name])
+        job.status = ImageProcessingJob.Status.DONE
+    except ImageProcessingError as error:
+        job.status = ImageProcessingJob.Status.FAILED
+        job.error = str(error)
+    except Exception:
+        logger.exception("Image processing job %s failed", job.pk)
+        job.status = ImageProcessingJob.Status.FAILED
+        job.error = "Image processing failed."
+    job.save(update_fields=["status", "target_key", "error", "last_update"])
+    default_storage.delete(job.source_key)
+
+
+def recover_stale_image_processing_jobs() -> tuple:
+    """
+    Finish the jobs lost by restarted or crashed workers.
+
+    Stale pending jobs are run, stale processing ones are marked failed as
+    they may have been interrupted halfway. Return the numbers of jobs run
+    and failed.
+    """
+    stale_jobs = ImageProcessingJob.objects.filter(
+        last_update__lt=ImageProcessingJob.get_stale_date()
+    )
+    failed_jobs = dict(
+        stale_jobs.filter(
+            status=ImageProcessingJob.Status.PROCESSING
+        ).values_list("pk", "source_key")
+    )
+    failed = ImageProcessingJob.objects.filter(
+        pk__in=failed_jobs, status=ImageProcessingJob.Status.PROCESSING
+    ).update(
+        status=ImageProcessingJob.Status.FAILED,
+        error="Image processing interrupted.",
+        last_update=timezone.now(),
+    )
+    for source_key in failed_jobs.values():
+        StorageDeletion.enqueue(source_key)
+    pending_job_ids = list(
+        stale_jobs.filter(status=ImageProcessingJob.Status.PENDING)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    for job_id in pending_job_ids:
+        run_image_processing_job(job_id)
+    return len(pending_job_ids), failed
+
+
+def resize_image(
+    data: bytes, size, crop: bool, image_format: str, variants=()
+) -> list:
+    """
+    Resize an image and its variants in the process pool, or inline if it
+    is disabled. See process_image_variants().
+    """
+    try:
+        if settings.IMAGE_PROCESSING_WORKERS <= 0:
+            return process_image_variants(
+                data, size, crop, image_format, variants
+            )
+        _, process_pool = get_image_processing_pools()
+        try:
+            return process_pool.submit(
+                process_image_variants,
+                data,
+                size,
+                crop,
+                image_format,
+                variants,
+            ).result()
+        except BrokenProcessPool:
+            # A pool process died (e.g. out of memory), later jobs get a
+            # new pool.
+            reset_process_pool(process_pool)
+            raise
+    except (OSError, ValueError, Image.DecompressionBombError) as error:
+        raise ImageProcessingError("Invalid or unsupported image.") from error
+
+
+def get_image_processing_pools():
+    """
+    Return the (thread pool, process pool) running image processing jobs.
+
+    Jobs are run by threads waiting on the process pool, both bounded by
+    IMAGE_PROCESSING_WORKERS. Pools are created on first use, and again in
+    forked processes. Pool processes are spawned, so they do not inherit
+    the threads, connections and memory of the web worker.
+    """
+    global _pools
+    pid = os.getpid()
+    with _pools_lock:
+        if _pools is None or _pools[0] != pid:
+            workers = settings.IMAGE_PROCESSING_WORKERS
+            _pools = (
+                pid,
+                ThreadPoolExecutor(workers, "image-processing"),
+                create_process_pool(),
+            )
+        return _pools[1], _pools[2]
+
+
+def create_process_pool():
+    return ProcessPoolExecutor(
+        settings.IMAGE_PROCESSING_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def reset_process_pool(process_pool):
+    """Replace a broken process pool, unless it was already replaced."""
+    global _pools
+    with _pools_lock:
+        if _pools is not None and _pools[2] is process_pool:
+            _pools = (_pools[0], _pools[1], create_process_pool())
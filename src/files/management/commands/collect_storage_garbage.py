@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from files.storage_gc import StorageGarbageCollector
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete stored thumbnails, backgrounds, profile pictures and uploads "
+        "no longer referenced by live or historical records."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List the files to delete without deleting them.",
+        )
+        parser.add_argument(
+            "--grace-hours",
+            type=int,
+            default=24,
+            help="Keep files newer than this number of hours (default: 24).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of files listed and deleted at once (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        collector = StorageGarbageCollector(
+            grace_period=timedelta(hours=options["grace_hours"]),
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+        )
+        count = 0
+        for key in collector.collect():
+            count += 1
+            if options["dry_run"] or options["verbosity"] > 1:
+                self.stdout.write(key)
+        for key in collector.failed_keys:
+            self.stderr.write(f"Failed to delete {key}")
+        if options["dry_run"]:
+            self.stdout.write(
+                self.style.SUCCESS(f"{count} orphaned files to delete.")
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"{count} orphaned files deleted.")
+            )
@@ -0,0 +1,49 @@
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from files.image_processing import process_image_variants
+from files.variants import IMAGE_VARIANTS, get_variant_key, get_variants
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the missing variants of the stored backgrounds and profile "
+        "pictures, uploaded before variants were generated."
+    )
+
+    def handle(self, *args, **options):
+        count = 0
+        for model_label, field_name in IMAGE_VARIANTS:
+            model = apps.get_model(model_label)
+            field = model._meta.get_field(field_name)
+            variants = get_variants(field)
+            keys = (
+                model._base_manager.exclude(**{field_name: ""})
+                .exclude(**{f"{field_name}__isnull": True})
+                .values_list(field_name, flat=True)
+            )
+            for key in keys.iterator():
+                variant_keys = [
+                    get_variant_key(key, size[0], image_format)
+                    for size, image_format in variants
+                ]
+                if all(map(default_storage.exists, variant_keys)):
+                    continue
+                with default_storage.open(key, "rb") as file:
+                    data = file.read()
+                _, *variant_images = process_image_variants(
+                    data, field.size, bool(field.crop), None, variants
+                )
+                for variant_key, variant_image in zip(
+                    variant_keys, variant_images
+                ):
+                    if not default_storage.exists(variant_key):
+                        default_storage.save(
+                            variant_key, ContentFile(variant_image)
+                        )
+                count += 1
+        self.stdout.write(
+            self.style.SUCCESS(f"Variants generated for {count} images.")
+        )
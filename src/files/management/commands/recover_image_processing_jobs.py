@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from files.jobs import recover_stale_image_processing_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Run or fail the image processing jobs left unfinished for more "
+        "than IMAGE_PROCESSING_JOB_TIMEOUT seconds, e.g. by a restarted "
+        "worker."
+    )
+
+    def handle(self, *args, **options):
+        run, failed = recover_stale_image_processing_jobs()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{run} stale pending jobs run, {failed} interrupted jobs "
+                "failed."
+            )
+        )
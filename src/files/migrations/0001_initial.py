@@ -0,0 +1,79 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:50
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImageProcessingJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("processing", "Processing"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("source_key", models.CharField(max_length=255)),
+                ("target_key", models.CharField(max_length=255)),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("field_name", models.CharField(max_length=100)),
+                ("attach", models.BooleanField(default=True)),
+                ("error", models.TextField(blank=True)),
+                ("creation_date", models.DateTimeField(auto_now_add=True)),
+                ("last_update", models.DateTimeField(auto_now=True)),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+                (
+                    "create_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="image_processing_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Image processing job",
+                "verbose_name_plural": "Image processing jobs",
+                "indexes": [
+                    models.Index(
+                        fields=["content_type", "object_id", "field_name"],
+                        name="files_image_content_6308fd_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("files", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StorageDeletion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=255, unique=True)),
+                ("creation_date", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Storage deletion",
+                "verbose_name_plural": "Storage deletions",
+            },
+        ),
+    ]
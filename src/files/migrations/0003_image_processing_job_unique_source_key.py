@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("files", "0002_storage_deletion"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="imageprocessingjob",
+            name="source_key",
+            field=models.CharField(max_length=255, unique=True),
+        ),
+    ]
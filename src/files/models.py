@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils import timezone
+
+from users.models import User
+
+
+class ImageProcessingJob(models.Model):
+    """
+    Resizing and re-encoding of an uploaded image, run off-request.
+
+    The image is processed with the options of the target image field. If
+    attach is set, the processed image then replaces the field value.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        PROCESSING = "processing", "Processing"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    # Unique, so a stored upload is processed at most once.
+    source_key = models.CharField(max_length=255, unique=True)
+    target_key = models.CharField(max_length=255)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    target = GenericForeignKey("content_type", "object_id")
+    field_name = models.CharField(max_length=100)
+    attach = models.BooleanField(default=True)
+    error = models.TextField(blank=True)
+    create_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        related_name="image_processing_jobs",
+        blank=True,
+        null=True,
+    )
+    creation_date = models.DateTimeField(auto_now_add=True)
+    last_update = models.DateTimeField(auto_now=True)
+
+    def get_field(self):
+        """Return the image field the job processes an image for."""
+        return self.content_type.model_class()._meta.get_field(self.field_name)
+
+    def is_superseded(self) -> bool:
+        """Return whether a newer upload targets the same field."""
+        return ImageProcessingJob.objects.filter(
+            content_type=self.content_type_id,
+            object_id=self.object_id,
+            field_name=self.field_name,
+            attach=True,
+            pk__gt=self.pk,
+        ).exists()
+
+    @classmethod
+    def get_stale_date(cls):
+        """
+        Return the date before which unfinished jobs are considered lost.
+
+        Jobs only live in the pools of the worker which queued them, so the
+        ones a restarted worker queued or ran are never finished.
+        """
+        return timezone.now() - timedelta(
+            seconds=settings.IMAGE_PROCESSING_JOB_TIMEOUT
+        )
+
+    class Meta:
+        verbose_name = "Image processing job"
+        verbose_name_plural = "Image processing jobs"
+        indexes = [
+            models.Index(fields=["content_type", "object_id", "field_name"]),
+        ]
+
+
+class StorageDeletion(models.Model):
+    """
+    Stored file queued for deletion by the storage garbage collector.
+
+    The file is only deleted if it is no longer referenced, by live or
+    historical records, once the grace period is over.
+    """
+
+    key = models.CharField(max_length=255, unique=True)
+    creation_date = models.DateTimeField(auto_now_add=True)
+
+    @classmethod
+    def enqueue(cls, key: str):
+        """Queue a stored file for deletion, if not already queued."""
+        if key:
+            cls.objects.bulk_create([cls(key=key)], ignore_conflicts=True)
+
+    class Meta:
+        verbose_name = "Storage deletion"
+        verbose_name_plural = "Storage deletions"
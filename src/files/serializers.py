@@ -0,0 +1,60 @@
+from rest_framework import serializers
+
+from .image_processing import get_image_format
+from .models import ImageProcessingJob
+
+
+class ImageUploadField(serializers.FileField):
+    """
+    File field accepting images, checked from their header only.
+
+    Images are decoded when processed, off-request. The detected format is
+    set on the file as image_format.
+    """
+
+    default_error_messages = {
+        "invalid_image": "Upload a valid image. The file you uploaded was "
+        "either not an image or a corrupted image.",
+    }
+
+    def to_internal_value(self, data):
+        file = super().to_internal_value(data)
+        image_format = get_image_format(file)
+        if image_format is None:
+            self.fail("invalid_image")
+        file.image_format = image_format
+        return file
+
+
+class ImageProcessingJobSerializer(serializers.ModelSerializer):
+    """Serializer for the status of an image processing job."""
+
+    class Meta:
+        model = ImageProcessingJob
+        fields = [
+            "id",
+            "status",
+            "target_key",
+            "error",
+            "creation_date",
+            "last_update",
+        ]
+        read_only_fields = fields
+
+
+class DirectUploadSerializer(serializers.Serializer):
+    """Serializer for direct upload requests."""
+
+    filename = serializers.CharField(max_length=255)
+    content_type = serializers.CharField(max_length=100)
+
+    def validate_content_type(self, value):
+        if not value.startswith("image/"):
+            raise serializers.ValidationError("Only images can be uploaded.")
+        return value
+
+
+class DirectUploadFinalizeSerializer(serializers.Serializer):
+    """Serializer for direct upload finalization."""
+
+    token = serializers.CharField()
@@ -0,0 +1,142 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import models
+from django.utils import timezone
+
+from _config.services.storage_utils.storage_batch import (
+    delete_stored_files,
+    iter_stored_file_batches,
+    to_aware_datetime,
+)
+from _config.services.storage_utils.upload_handler import UPLOADS_BASE_KEY
+
+from .jobs import ORIGINALS_BASE_KEY
+from .models import ImageProcessingJob, StorageDeletion
+from .variants import get_variant_keys, get_variant_widths
+
+# Storage prefixes holding files owned by model fields or uploads.
+GARBAGE_COLLECTED_PREFIXES = [
+    "v1/actions/",
+    "v1/user-preferences/",
+    "v1/system-info/default-background/",
+    "users/profile_pictures/",
+    UPLOADS_BASE_KEY,
+    ORIGINALS_BASE_KEY,
+]
+
+
+def get_referenced_keys() -> set:
+    """
+    Return the keys of all the stored files still referenced.
+
+    Historical records keep the keys of replaced files, as file fields are
+    stored as char fields (SIMPLE_HISTORY_FILEFIELD_TO_CHARFIELD). Variants
+    of referenced images and files of pending image processing jobs are
+    referenced too, unless the jobs are stale.
+    """
+    keys = set()
+    for model in apps.get_models():
+        # Historical models mirror the file fields of their tracked model.
+        tracked_model = getattr(model, "instance_type", model)
+        for field_name in get_file_field_names(tracked_model):
+            variant_widths = get_variant_widths(tracked_model, field_name)
+            for key in (
+                model._base_manager.exclude(**{field_name: ""})
+                .exclude(**{f"{field_name}__isnull": True})
+                .values_list(field_name, flat=True)
+                .iterator()
+            ):
+                keys.add(key)
+                keys.update(get_variant_keys(key, variant_widths))
+    for source_key, target_key in ImageProcessingJob.objects.filter(
+        status__in=[
+            ImageProcessingJob.Status.PENDING,
+            ImageProcessingJob.Status.PROCESSING,
+        ],
+        last_update__gte=ImageProcessingJob.get_stale_date(),
+    ).values_list("source_key", "target_key"):
+        keys.update((source_key, target_key))
+    return keys
+
+
+def get_file_field_names(model) -> list:
+    """Return the names of the file fields of a model."""
+    return [
+        field.name
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField)
+    ]
+
+
+class StorageGarbageCollector:
+    """
+    Delete the stored files no longer referenced.
+
+    Queued deletions are processed first, then the storage prefixes are
+    listed in batches and diffed against the referenced keys. Only files
+    older than the grace period are deleted, so uploads in progress are
+    kept. With dry_run, the files are reported without being deleted.
+    """
+
+    def __init__(
+        self,
+        grace_period: timedelta,
+        batch_size: int = 1000,
+        dry_run: bool = False,
+    ):
+        self.grace_period = grace_period
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.failed_keys = []
+
+    def collect(self):
+        """Yield the keys of the deleted files."""
+        deadline = timezone.now() - self.grace_period
+        referenced_keys = get_referenced_keys()
+        queued_keys = set()
+        for key in self.process_queue(referenced_keys, deadline):
+            queued_keys.add(key)
+            yield key
+        for prefix in GARBAGE_COLLECTED_PREFIXES:
+            for batch in iter_stored_file_batches(prefix, self.batch_size):
+                yield from self.delete(
+                    [
+                        key
+                        for key, modified in batch
+                        if key not in referenced_keys
+                        and key not in queued_keys
+                        and to_aware_datetime(modified) < deadline
+                    ]
+                )
+
+    def process_queue(self, referenced_keys: set, deadline):
+        """Delete the queued files, dropping the ones still referenced."""
+        queue = StorageDeletion.objects.filter(creation_date__lt=deadline)
+        last_id = 0
+        while True:
+            batch = list(
+                queue.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", "key")[: self.batch_size]
+            )
+            if not batch:
+                return
+            last_id = batch[-1][0]
+            yield from self.delete(
+                [key for _, key in batch if key not in referenced_keys]
+            )
+            if not self.dry_run:
+                # Files failing to delete stay queued for the next run.
+                StorageDeletion.objects.filter(
+                    id__in=[deletion_id for deletion_id, _ in batch]
+                ).exclude(key__in=self.failed_keys).delete()
+
+    def delete(self, keys: list):
+        if not keys:
+            return
+        if not self.dry_run:
+            failed_keys = set(delete_stored_files(keys))
+            self.failed_keys.extend(failed_keys)
+            keys = [key for key in keys if key not in failed_keys]
+        yield from keys
@@ -0,0 +1,16 @@
+from django.urls import path
+from rest_framework import routers
+
+from .views import ImageProcessingJobViewSet, local_upload_file
+
+router = routers.DefaultRouter(trailing_slash=False)
+router.register(
+    r"image-processing-jobs",
+    ImageProcessingJobViewSet,
+    basename="image-processing-jobs",
+)
+
+urlpatterns = [
+    *router.urls,
+    path("uploads/<str:filename>", local_upload_file, name="local-upload-file"),
+]
@@ -0,0 +1,129 @@
+import os
+
+from django.conf import settings
+
+from users.models import User
+
+# Formats of the image variants, requested with the image_format query
+# parameter.
+IMAGE_VARIANT_FORMATS = ("WEBP", "PNG")
+
+# (size hint query parameter, variant widths) of the image fields with
+# variants, by (model label, field name).
+IMAGE_VARIANTS = {
+    ("users.User", "profile_picture"): (
+        "avatar_size",
+        User.PROFILE_VARIANT_WIDTHS,
+    ),
+    ("users.UserPreferences", "custom_background_image"): (
+        "background_width",
+        settings.GALLERY_BACKGROUND_IMAGE_VARIANT_WIDTHS,
+    ),
+    ("system.SystemInfo", "default_background_image"): (
+        "background_width",
+        settings.GALLERY_BACKGROUND_IMAGE_VARIANT_WIDTHS,
+    ),
+}
+
+
+def get_variant_widths(model, field_name: str) -> tuple:
+    """Return the variant widths of an image field, if it has variants."""
+    return IMAGE_VARIANTS.get((model._meta.label, field_name), (None, ()))[1]
+
+
+def get_variant_sizes(size, widths) -> list:
+    """Return the sizes of variants, with the aspect ratio of size."""
+    return [(width, round(width * size[1] / size[0])) for width in widths]
+
+
+def get_variants(field) -> list:
+    """Return the (size, format) of the variants of an image field."""
+    return [
+        (size, image_format)
+        for size in get_variant_sizes(
+            field.size, get_variant_widths(field.model, field.name)
+        )
+        for image_format in IMAGE_VARIANT_FORMATS
+    ]
+
+
+def get_variant_key(key: str, width: int, image_format: str) -> str:
+    """Return the storage key of a variant of a stored image."""
+    return f"{os.path.splitext(key)[0]}-{width}w.{image_format.lower()}"
+
+
+def get_variant_keys(key: str, widths) -> list:
+    """Return the storage keys of all variants of a stored image."""
+    return [
+        get_variant_key(key, width, image_format)
+        for width in widths
+        for image_format in IMAGE_VARIANT_FORMATS
+    ]
+
+
+def get_negotiated_image_key(request, instance, field_name: str) -> str:
+    """
+    Return the key of the image variant best suited to a request.
+
+    The format is the image_format query parameter (webp or png, default
+    png). The width is the smallest one at least the size hint query
+    parameter, in device pixels (e.g. ?background_width=1280). Without
+    both, the image itself is served.
+    """
+    key = getattr(instance, field_name).name
+    size_hint_param, widths = IMAGE_VARIANTS.get(
+        (instance._meta.label, field_name), (None, ())
+    )
+    if request is None or not widths:
+        return key
+    image_format = get_image_format_hint(request)
+    size_hint = get_size_hint(request, size_hint_param)
+    if image_format is None and size_hint is None:
+        return key
+    width = instance._meta.get_field(field_name).size[0]
+    if size_hint is not None:
+        width = next(
+            (
+                variant_width
+                for variant_width in sorted(widths)
+                if variant_width >= size_hint
+            ),
+            max(widths),
+        )
+    return get_variant_key(key, width, image_format or "PNG")
+
+
+def get_image_format_hint(request) -> str:
+    image_format = request.query_params.get("image_format", "").upper()
+    return image_format if image_format in IMAGE_VARIANT_FORMATS else None
+
+
+def get_size_hint(request, size_hint_param: str) -> int:
+    try:
+        return int(request.query_params.get(size_hint_param, ""))
+    except ValueError:
+        return None
+
+
+def get_image_negotiation_etag(request) -> tuple:
+    """
+    Return the request inputs of the image variants, for response ETags.
+    """
+    size_hint_params = sorted({param for param, _ in IMAGE_VARIANTS.values()})
+    return (
+        get_image_format_hint(request),
+        *(get_size_hint(request, param) for param in size_hint_params),
+    )
+
+
+def get_requested_image_key(instance, field_name: str, filename: str) -> str:
+    """
+    Return the key of the image, or of its variant named filename.
+    """
+    key = getattr(instance, field_name).name
+    for variant_key in get_variant_keys(
+        key, get_variant_widths(type(instance), field_name)
+    ):
+        if os.path.basename(variant_key) == filename:
+            return variant_key
+    return key
@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from _config.parsers import UploadTooLarge
+from _config.permissions import IsFileUploadAuthenticated
+from _config.services.storage_utils.file_response import FILE_CHUNK_SIZE
+from _config.services.storage_utils.storage_writer import open_storage_writer
+from _config.services.storage_utils.upload_handler import UPLOADS_BASE_KEY
+
+from .models import ImageProcessingJob
+from .serializers import ImageProcessingJobSerializer
+
+
+def get_image_processing_status(job: ImageProcessingJob) -> int:
+    """Return the status code of an upload response, from its job."""
+    if job.status == ImageProcessingJob.Status.DONE:
+        return status.HTTP_200_OK
+    if job.status == ImageProcessingJob.Status.FAILED:
+        return status.HTTP_400_BAD_REQUEST
+    return status.HTTP_202_ACCEPTED
+
+
+class ImageProcessingJobViewSet(
+    mixins.RetrieveModelMixin, viewsets.GenericViewSet
+):
+    """API endpoint to poll the status of image processing jobs."""
+
+    queryset = ImageProcessingJob.objects.all()
+    serializer_class = ImageProcessingJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.user.is_admin:
+            return queryset
+        return queryset.filter(create_by=self.request.user)
+
+
+@api_view(["PUT"])
+@permission_classes([IsFileUploadAuthenticated])
+def local_upload_file(request, filename=None):
+    """
+    Store a file uploaded to a local presigned upload URL.
+
+    Local stand-in for direct uploads to the object storage, the request
+    body is streamed to the file.
+    """
+    key = f"{UPLOADS_BASE_KEY}{filename}"
+    if settings.STORAGE_BACKEND != "local" or request.upload_key != key:
+        raise PermissionDenied("Invalid file key provided.")
+    if default_storage.exists(key):
+        return Response(
+            "File already uploaded.", status=status.HTTP_409_CONFLICT
+        )
+
+    writer = open_storage_writer(key)
+    try:
+        stream = request.stream
+        while stream is not None:
+            chunk = stream.read(FILE_CHUNK_SIZE)
+            if not chunk:
+                break
+            writer.write(chunk)
+            if writer.size > settings.UPLOAD_MAX_SIZE:
+                raise UploadTooLarge()
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+    return Response(status=status.HTTP_204_NO_CONTENT)
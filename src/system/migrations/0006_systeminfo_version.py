@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("system", "0005_systeminfo_allow_showing_description"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="systeminfo",
+            name="version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,9 +1,18 @@
+import threading
+import time
 import uuid
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django_resized import ResizedImageField
 
+from _config.models import VersionedModel
+
+# (version, field values, monotonic time of the last version check) of the
+# SystemInfo row kept by this process, see SystemInfo.get_instance().
+_system_info_cache = None
+_system_info_cache_lock = threading.Lock()
+
 
 class SingletonModel(models.Model):
     class Meta:
@@ -35,7 +44,7 @@ def get_default_background_base_key():
     return "v1/system-info/default-background/"
 
 
-class SystemInfo(SingletonModel):
+class SystemInfo(SingletonModel, VersionedModel):
     allow_action_workspaces = models.BooleanField(default=False)
     allow_showing_description = models.BooleanField(default=True)
 
@@ -52,3 +61,56 @@ class SystemInfo(SingletonModel):
 
     allow_action_sections = models.BooleanField(default=False)
     allow_users_to_hide_actions = models.BooleanField(default=False)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Other processes see the new version on their next check.
+        transaction.on_commit(reset_system_info_cache)
+
+    @classmethod
+    def get_instance(cls, cached: bool = True):
+        """
+        Return the system info, from the copy kept by this process.
+
+        The copy is reused for SYSTEM_INFO_CACHE_TTL seconds without any
+        query, then kept as long as the stored version is unchanged. Each
+        call returns a new instance. Use cached=False to read the row
+        before updating it.
+        """
+        global _system_info_cache
+        if not cached or settings.SYSTEM_INFO_CACHE_TTL <= 0:
+            return super().get_instance()
+        field_names = [field.attname for field in cls._meta.concrete_fields]
+        cache = _system_info_cache
+        now = time.monotonic()
+        if cache is not None:
+            version, values, checked_at = cache
+            if now - checked_at >= settings.SYSTEM_INFO_CACHE_TTL:
+                stored_version = (
+                    cls.objects.filter(pk=1)
+                    .values_list("version", flat=True)
+                    .first()
+                )
+                with _system_info_cache_lock:
+                    if stored_version != version:
+                        cache = None
+                    elif _system_info_cache is cache:
+                        _system_info_cache = (version, values, now)
+            if cache is not None:
+                return cls.from_db(cls.objects.db, field_names, values)
+
+        instance = super().get_instance()
+        values = [
+            field.get_prep_value(getattr(instance, field.attname))
+            for field in cls._meta.concrete_fields
+        ]
+        with _system_info_cache_lock:
+            _system_info_cache = (instance.version, values, now)
+        return instance
+
+
+def reset_system_info_cache():
+    """Drop the system info kept by this process."""
+    global _system_info_cache
+    with _system_info_cache_lock:
+        _system_info_cache = None
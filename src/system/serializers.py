@@ -1,12 +1,18 @@
 from django.core.exceptions import ValidationError
 from rest_framework import serializers
 
-from _config.services.storage_utils import generate_presigned_url
+from _config.services.storage_utils.presigned_url_serializers import (
+    PresignedUrlSerializerMixin,
+)
+from files.serializers import ImageUploadField
+from files.variants import get_negotiated_image_key
 
 from .models import SystemInfo
 
 
-class SystemInfoSerializer(serializers.ModelSerializer):
+class SystemInfoSerializer(
+    PresignedUrlSerializerMixin, serializers.ModelSerializer
+):
     default_background_image_url = serializers.SerializerMethodField()
 
     class Meta:
@@ -25,8 +31,10 @@ class SystemInfoSerializer(serializers.ModelSerializer):
     def get_default_background_image_url(self, obj: SystemInfo) -> str:
         """Return system default background image url."""
         if bool(obj.default_background_image):
-            return generate_presigned_url(
-                obj.default_background_image.name, self.context["request"]
+            return self.get_presigned_url(
+                get_negotiated_image_key(
+                    self.context.get("request"), obj, "default_background_image"
+                )
             )
         return None
 
@@ -36,6 +44,8 @@ class SystemInfoDefaultBackgroundImageSerializer(serializers.ModelSerializer):
 
     PICTURE_MAX_SIZE_MB = 100
 
+    default_background_image = ImageUploadField(required=False, allow_null=True)
+
     class Meta:
         model = SystemInfo
         fields = [
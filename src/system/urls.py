@@ -2,12 +2,25 @@ from django.urls import path
 from .views import (
     SystemInfoView,
     SystemDefaultBackgroundView,
+    SystemDefaultBackgroundUploadFinalizeView,
+    SystemDefaultBackgroundUploadView,
     system_default_background_file,
 )
 
 urlpatterns = [
     path("system-info", SystemInfoView.as_view(), name="system-info"),
     path("system-info/default-background", SystemDefaultBackgroundView.as_view()),
+    # Not under default-background/, which routes background files.
+    path(
+        "system-info/default-background-upload",
+        SystemDefaultBackgroundUploadView.as_view(),
+        name="system-default-background-upload",
+    ),
+    path(
+        "system-info/default-background-upload/finalize",
+        SystemDefaultBackgroundUploadFinalizeView.as_view(),
+        name="system-default-background-upload-finalize",
+    ),
     path(
         "system-info/default-background/<str:filename>",
         system_default_background_file,
@@ -1,15 +1,42 @@
-import mimetypes
+import os
 
 from django.core.exceptions import ValidationError
-from django.http import FileResponse
+from django.http import Http404
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.parsers import FormParser, JSONParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from _config.parsers import StorageMultiPartParser
 from _config.permissions import IsFileAuthenticated
-from _config.services.storage_utils import generate_presigned_url
+from _config.services.conditional_get import (
+    build_etag,
+    get_not_modified_response,
+    set_etag,
+)
+from _config.services.storage_utils import (
+    generate_presigned_url,
+    get_presigned_url_epoch,
+)
+from _config.services.storage_utils.file_response import build_file_response
+from files.direct_uploads import (
+    finalize_direct_upload,
+    initiate_direct_upload,
+)
+from files.jobs import create_image_processing_job
+from files.models import StorageDeletion
+from files.serializers import (
+    DirectUploadFinalizeSerializer,
+    DirectUploadSerializer,
+    ImageProcessingJobSerializer,
+)
+from files.variants import (
+    get_image_negotiation_etag,
+    get_requested_image_key,
+)
+from files.views import get_image_processing_status
 from users.permissions import IsAdmin
 
 from .models import SystemInfo
@@ -31,13 +58,23 @@ class SystemInfoView(APIView):
 
     def get(self, request):
         system_info = SystemInfo.get_instance()
+        etag = build_etag(
+            "system-info",
+            request.user.pk,
+            system_info.version,
+            get_presigned_url_epoch(),
+            get_image_negotiation_etag(request),
+        )
+        not_modified_response = get_not_modified_response(request, etag)
+        if not_modified_response:
+            return not_modified_response
         serializer = SystemInfoSerializer(
             system_info, context={"request": request}
         )
-        return Response(serializer.data)
+        return set_etag(Response(serializer.data), etag)
 
     def patch(self, request):
-        system_info = SystemInfo.get_instance()
+        system_info = SystemInfo.get_instance(cached=False)
         serializer = SystemInfoSerializer(
             system_info,
             data=request.data,
@@ -58,47 +95,97 @@ class SystemInfoView(APIView):
 def system_default_background_file(request, pk=None, filename=None):
     """Get system default background."""
     system_info = SystemInfo.get_instance()
-    if (
-        request.file_key
-        and request.file_key != system_info.default_background_image.name
-    ):
-        raise ValidationError("Invalid file key provided.")
-    content_type = (
-        mimetypes.guess_type(system_info.default_background_image.name)[0]
-        or "application/octet-stream"
+    key = get_requested_image_key(
+        system_info, "default_background_image", filename
     )
-    return FileResponse(
-        system_info.default_background_image, content_type=content_type
+    if request.file_key and request.file_key != key:
+        raise ValidationError("Invalid file key provided.")
+    if not system_info.default_background_image:
+        raise Http404("Default background not found")
+    return build_file_response(
+        request, key, immutable=filename == os.path.basename(key)
     )
 
 
 class SystemDefaultBackgroundView(APIView):
     permission_classes = [IsAuthenticated | IsFileAuthenticated, IsAdmin]
+    parser_classes = [JSONParser, FormParser, StorageMultiPartParser]
 
     def put(self, request):
-        system_info = SystemInfo.get_instance()
+        system_info = SystemInfo.get_instance(cached=False)
         serializer = SystemInfoDefaultBackgroundImageSerializer(
             data=request.data
         )
         serializer.is_valid(raise_exception=True)
-        system_info.default_background_image = serializer.validated_data[
-            "default_background_image"
-        ]
-        system_info.save()
-        return Response(
-            {
-                "default_background_image_url": generate_presigned_url(
-                    system_info.default_background_image.name,
-                    request,
-                )
-            }
+        image = serializer.validated_data["default_background_image"]
+        if not image:
+            system_info.default_background_image = None
+            system_info.save()
+            return Response({"default_background_image_url": None})
+        # Resized off-request, it replaces the current image once done.
+        job = create_image_processing_job(
+            image, system_info, "default_background_image", request.user
         )
+        return get_default_background_job_response(request, job)
 
     def delete(self, request):
-        system_info = SystemInfo.get_instance()
-        system_info.default_background_image.delete()
+        system_info = SystemInfo.get_instance(cached=False)
+        StorageDeletion.enqueue(system_info.default_background_image.name)
+        system_info.default_background_image = None
         system_info.save()
         return Response(
             "Default background image deleted.",
             status=status.HTTP_204_NO_CONTENT,
         )
+
+
+class SystemDefaultBackgroundUploadView(APIView):
+    """Start a direct upload of the default background to the storage."""
+
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def post(self, request):
+        serializer = DirectUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            initiate_direct_upload(
+                request,
+                SystemInfo.get_instance(),
+                "default_background_image",
+                **serializer.validated_data,
+            )
+        )
+
+
+class SystemDefaultBackgroundUploadFinalizeView(APIView):
+    """Check a directly uploaded default background and queue its processing."""
+
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def post(self, request):
+        serializer = DirectUploadFinalizeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = finalize_direct_upload(
+            request,
+            serializer.validated_data["token"],
+            SystemInfo.get_instance(),
+            "default_background_image",
+            max_size_mb=(
+                SystemInfoDefaultBackgroundImageSerializer.PICTURE_MAX_SIZE_MB
+            ),
+        )
+        return get_default_background_job_response(request, job)
+
+
+def get_default_background_job_response(request, job):
+    """Return the URL of a default background being processed."""
+    return Response(
+        {
+            "default_background_image_url": generate_presigned_url(
+                job.target_key,
+                request,
+            ),
+            "job": ImageProcessingJobSerializer(job).data,
+        },
+        status=get_image_processing_status(job),
+    )
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0007_userpreferences_allow_showing_description"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userpreferences",
+            name="version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,21 +1,41 @@
 import uuid
+from functools import cached_property
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import PermissionDenied
 from django.core.validators import MinLengthValidator
-from django.db import models
-from django.db.models.signals import post_save, pre_delete, pre_save
+from django.db import models, transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
 from django_group_model.models import AbstractGroup
 from django_resized import ResizedImageField
 from django_scim.models import AbstractSCIMGroupMixin, AbstractSCIMUserMixin
 
+from _config.models import VersionedModel
+from _config.services.admin_group import (
+    get_admin_group_id,
+    reset_admin_group_id,
+)
+
 
 class Group(AbstractSCIMGroupMixin, AbstractGroup):
     pass
 
 
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def reset_cached_admin_group(sender, instance, **kwargs):
+    # Renames and deletes, e.g. from SCIM, may change the admin group.
+    transaction.on_commit(reset_admin_group_id)
+
+
 def generate_profile_picture_path(self, filename):
     """Generate the upload path for the thumbnail"""
     return f"users/profile_pictures/{str(uuid.uuid4())}.${self.PROFILE_FORMAT.lower()}"
@@ -38,6 +58,7 @@ class User(AbstractSCIMUserMixin, AbstractUser):
 
     PROFILE_RESOLUTION = (300, 300)
     PROFILE_FORMAT = "PNG"
+    PROFILE_VARIANT_WIDTHS = (48, 96, 300)
 
     username = models.CharField(
         max_length=40,
@@ -75,15 +96,35 @@ class User(AbstractSCIMUserMixin, AbstractUser):
             self.groups.all() if settings.SCIM_ENABLED else Group.objects.none()
         )
 
-    @property
+    @cached_property
     def is_superuser_group_member(self):
-        if settings.ADMIN_GROUP and settings.SCIM_ENABLED:
-            superadmin_group = Group.objects.filter(
-                name=settings.ADMIN_GROUP
-            ).first()
-            if superadmin_group and superadmin_group in self.groups.all():
-                return True
-        return False
+        """
+        Return whether the user is in the SCIM admin group.
+
+        Computed once per instance, so once per request for request.user,
+        and reset when the user groups change. Prefetched groups are used
+        if any.
+        """
+        if not settings.SCIM_ENABLED:
+            return False
+        admin_group_id = get_admin_group_id()
+        if admin_group_id is None:
+            return False
+        if "groups" in getattr(self, "_prefetched_objects_cache", {}):
+            return any(
+                group.id == admin_group_id for group in self.groups.all()
+            )
+        return self.groups.filter(pk=admin_group_id).exists()
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        deferred_fields = self.get_deferred_fields()
+        if fields is not None and deferred_fields.issuperset(fields):
+            # Load all deferred fields at once, e.g. of users built from
+            # access token claims, rather than one query per field.
+            super().refresh_from_db(using, deferred_fields, **kwargs)
+            return
+        super().refresh_from_db(using, fields, **kwargs)
+        self.__dict__.pop("is_superuser_group_member", None)
 
     @property
     def is_admin(self):
@@ -136,10 +177,41 @@ def check_last_admin_update(sender, instance, **kwargs):
             )
 
 
+@receiver(pre_save, sender=User)
+def blacklist_deactivated_user_tokens(
+    sender, instance, update_fields, **kwargs
+):
+    if not instance.pk or instance.is_active:
+        return
+    if update_fields is not None and "is_active" not in update_fields:
+        return
+    was_active = (
+        User.objects.filter(pk=instance.pk)
+        .values_list("is_active", flat=True)
+        .first()
+    )
+    if was_active:
+        from auths.jwt.jwt_utils import backlist_users_tokens
+
+        user_id = instance.pk
+        # Only once deactivated, the save may still fail.
+        transaction.on_commit(lambda: backlist_users_tokens([user_id]))
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def reset_superuser_group_member(sender, instance, action, reverse, **kwargs):
+    # Other instances of the changed users are request-scoped and are
+    # discarded with their request.
+    if not reverse and action.startswith("post_"):
+        instance.__dict__.pop("is_superuser_group_member", None)
+
+
 @receiver(pre_delete, sender=User)
 def delete_profile_picture(sender, instance, **kwargs):
-    if instance.profile_picture:
-        instance.profile_picture.delete(save=False)
+    from files.models import StorageDeletion
+
+    # Deleted by the storage garbage collector, once no longer referenced.
+    StorageDeletion.enqueue(instance.profile_picture.name)
 
 
 @receiver(pre_save, sender=User)
@@ -150,7 +222,9 @@ def delete_replaced_profile_picture(sender, instance, **kwargs):
     if not old_instance.profile_picture:
         return
     if old_instance.profile_picture != instance.profile_picture:
-        old_instance.profile_picture.delete(save=False)
+        from files.models import StorageDeletion
+
+        StorageDeletion.enqueue(old_instance.profile_picture.name)
 
 
 class Role(models.Model):
@@ -180,7 +254,7 @@ def get_custom_background_base_key(instance):
     return f"v1/user-preferences/{instance.user.id}/backgrounds/"
 
 
-class UserPreferences(models.Model):
+class UserPreferences(VersionedModel):
     user = models.OneToOneField(
         User, on_delete=models.CASCADE, related_name="preferences"
     )
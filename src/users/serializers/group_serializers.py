@@ -1,6 +1,6 @@
 from rest_framework import serializers
-from django.conf import settings
 
+from _config.services.admin_group import get_admin_group_id
 from users.models import Group
 from users.serializers.user_serializers import UserSerializer
 
@@ -21,10 +21,7 @@ class GroupSerializer(serializers.ModelSerializer):
 
     def get_is_admin_group(self, group: Group) -> bool:
         """Return True if group is admin group."""
-        admin_group = Group.objects.filter(name=settings.ADMIN_GROUP).first()
-        if not admin_group:
-            return False
-        return group.id == admin_group.id
+        return group.id == get_admin_group_id()
     
 
 class GroupDetailedSerializer(GroupSerializer):
@@ -1,25 +1,44 @@
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
-from _config.services.storage_utils import generate_presigned_url
+from _config.services.storage_utils.presigned_url_serializers import (
+    PresignedUrlListSerializer,
+    PresignedUrlSerializerMixin,
+)
+from files.serializers import ImageUploadField
+from files.variants import get_negotiated_image_key
 from users.models import UserPreferences
 
 
-class UserPreferencesSerializer(serializers.ModelSerializer):
+class UserPreferencesSerializer(
+    PresignedUrlSerializerMixin, serializers.ModelSerializer
+):
     """Serializer for User Preferences."""
 
     custom_background_image_url = serializers.SerializerMethodField()
 
+    def get_presigned_keys(self, obj: UserPreferences) -> list:
+        if bool(obj.custom_background_image):
+            return [
+                get_negotiated_image_key(
+                    self.context.get("request"), obj, "custom_background_image"
+                )
+            ]
+        return []
+
     def get_custom_background_image_url(self, obj: UserPreferences) -> str:
         """Return user's custom background image url."""
         if bool(obj.custom_background_image):
-            return generate_presigned_url(
-                obj.custom_background_image.name, self.context["request"]
+            return self.get_presigned_url(
+                get_negotiated_image_key(
+                    self.context.get("request"), obj, "custom_background_image"
+                )
             )
         return None
 
     class Meta:
         model = UserPreferences
+        list_serializer_class = PresignedUrlListSerializer
         fields = [
             "id",
             "disable_default_background_image",
@@ -39,6 +58,8 @@ class UserPreferenceCustomBackgroundImageSerializer(
 
     PICTURE_MAX_SIZE_MB = 10
 
+    custom_background_image = ImageUploadField(required=False, allow_null=True)
+
     class Meta:
         model = UserPreferences
         fields = [
@@ -3,8 +3,15 @@ from rest_framework import serializers
 from django.contrib.auth.hashers import make_password
 from rest_framework.exceptions import ValidationError
 from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
 from .user_preferences_serializers import UserPreferencesSerializer
 
+from _config.services.storage_utils.presigned_url_serializers import (
+    PresignedUrlListSerializer,
+    PresignedUrlSerializerMixin,
+)
+from files.serializers import ImageUploadField
+from files.variants import get_negotiated_image_key
 from users.models import User
 
 
@@ -16,7 +23,9 @@ class ShortUserSerializer(serializers.ModelSerializer):
         """Return profile picture url."""
         if bool(user.profile_picture):
             request = self.context.get("request")
-            file_name = user.profile_picture.name.split("/")[-1]
+            file_name = get_negotiated_image_key(
+                request, user, "profile_picture"
+            ).split("/")[-1]
             return request.build_absolute_uri(
                 reverse("user-profile", args=[user.id, file_name])
             )
@@ -42,7 +51,7 @@ class ShortUserSerializer(serializers.ModelSerializer):
         ]
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(PresignedUrlSerializerMixin, serializers.ModelSerializer):
     """Serializer for User model."""
 
     profile_picture_url = serializers.SerializerMethodField()
@@ -54,6 +63,7 @@ class UserSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = User
+        list_serializer_class = PresignedUrlListSerializer
         fields = [
             "id",
             "username",
@@ -87,17 +97,27 @@ class UserSerializer(serializers.ModelSerializer):
         """Return profile picture url."""
         if bool(user.profile_picture):
             request = self.context.get("request")
-            file_name = user.profile_picture.name.split("/")[-1]
+            file_name = get_negotiated_image_key(
+                request, user, "profile_picture"
+            ).split("/")[-1]
             return request.build_absolute_uri(
                 reverse("user-profile", args=[user.id, file_name])
             )
         return None
 
+    def get_presigned_keys(self, user: User) -> list:
+        """Return storage keys of the user preferences."""
+        try:
+            preferences = user.preferences
+        except ObjectDoesNotExist:
+            return []
+        return self.fields["preferences"].get_presigned_keys(preferences)
+
     def get_groups(self, user: User) -> list:
         """Return user groups."""
         if not settings.SCIM_ENABLED:
             return []
-        return user.groups.all().values_list("id", flat=True)
+        return [group.id for group in user.groups.all()]
 
     def validate_password(self, value: str) -> str:
         """Validate password."""
@@ -152,6 +172,8 @@ class UserProfilePictureSerializer(serializers.ModelSerializer):
 
     PICTURE_MAX_SIZE_MB = 10
 
+    profile_picture = ImageUploadField(required=False, allow_null=True)
+
     class Meta:
         model = User
         fields = [
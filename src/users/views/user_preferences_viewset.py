@@ -1,16 +1,43 @@
-import mimetypes
+import os
 from http import HTTPMethod
 from urllib import response
 
 from django.forms import ValidationError
-from django.http import FileResponse
+from django.http import Http404
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, JSONParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from _config.parsers import StorageMultiPartParser
 from _config.permissions import IsFileAuthenticated, IsOwner
-from _config.services.storage_utils.presigned_url import generate_presigned_url
+from _config.services.conditional_get import (
+    build_etag,
+    get_not_modified_response,
+    set_etag,
+)
+from _config.services.storage_utils.presigned_url import (
+    generate_presigned_url,
+    get_presigned_url_epoch,
+)
+from _config.services.storage_utils.file_response import build_file_response
+from files.direct_uploads import (
+    finalize_direct_upload,
+    initiate_direct_upload,
+)
+from files.jobs import create_image_processing_job
+from files.models import StorageDeletion
+from files.serializers import (
+    DirectUploadFinalizeSerializer,
+    DirectUploadSerializer,
+    ImageProcessingJobSerializer,
+)
+from files.variants import (
+    get_image_negotiation_etag,
+    get_requested_image_key,
+)
+from files.views import get_image_processing_status
 from users.models import UserPreferences
 from users.permissions import IsAdmin
 from users.serializers.user_preferences_serializers import (
@@ -33,6 +60,37 @@ class UserPreferencesViewSet(viewsets.ModelViewSet):
             return queryset
         return queryset.filter(user=self.request.user)
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        etag = build_etag(
+            "user-preferences",
+            request.user.pk,
+            request.META.get("QUERY_STRING", ""),
+            list(queryset.values_list("id", "version")),
+            get_presigned_url_epoch(),
+            get_image_negotiation_etag(request),
+        )
+        not_modified_response = get_not_modified_response(request, etag)
+        if not_modified_response:
+            return not_modified_response
+        return set_etag(super().list(request, *args, **kwargs), etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = build_etag(
+            "user-preferences",
+            request.user.pk,
+            instance.pk,
+            instance.version,
+            get_presigned_url_epoch(),
+            get_image_negotiation_etag(request),
+        )
+        not_modified_response = get_not_modified_response(request, etag)
+        if not_modified_response:
+            return not_modified_response
+        serializer = self.get_serializer(instance)
+        return set_etag(Response(serializer.data), etag)
+
     def create(self, request, *args, **kwargs):
         return response.Response(
             {"detail": "Method 'POST' not allowed."},
@@ -50,12 +108,16 @@ class UserPreferencesViewSet(viewsets.ModelViewSet):
         methods=[HTTPMethod.PUT, HTTPMethod.DELETE],
         url_name="background-image",
         url_path="background-image",
+        parser_classes=[JSONParser, FormParser, StorageMultiPartParser],
     )
     def set_background_image(self, request, pk=None):
         """Update user background image."""
         userPreferences = self.get_object()
         if request.method == HTTPMethod.DELETE:
-            userPreferences.custom_background_image.delete()
+            StorageDeletion.enqueue(
+                userPreferences.custom_background_image.name
+            )
+            userPreferences.custom_background_image = None
             userPreferences.save()
             return Response(
                 "Background image deleted.", status=status.HTTP_204_NO_CONTENT
@@ -65,18 +127,71 @@ class UserPreferencesViewSet(viewsets.ModelViewSet):
                 data=request.data
             )
             serializer.is_valid(raise_exception=True)
-            userPreferences.custom_background_image = serializer.validated_data[
-                "custom_background_image"
-            ]
-            userPreferences.save()
-            return Response(
-                {
-                    "custom_background_image_url": generate_presigned_url(
-                        userPreferences.custom_background_image.name,
-                        request,
-                    )
-                }
+            image = serializer.validated_data["custom_background_image"]
+            if not image:
+                userPreferences.custom_background_image = None
+                userPreferences.save()
+                return Response({"custom_background_image_url": None})
+            # Resized off-request, it replaces the current image once done.
+            job = create_image_processing_job(
+                image, userPreferences, "custom_background_image", request.user
             )
+            return self.get_background_job_response(request, job)
+
+    @action(
+        detail=True,
+        methods=[HTTPMethod.POST],
+        url_name="background-image-upload",
+        url_path="background-image/upload",
+    )
+    def initiate_background_image_upload(self, request, pk=None):
+        """Start a direct upload of a background image to the storage."""
+        user_preferences = self.get_object()
+        serializer = DirectUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            initiate_direct_upload(
+                request,
+                user_preferences,
+                "custom_background_image",
+                **serializer.validated_data,
+            )
+        )
+
+    @action(
+        detail=True,
+        methods=[HTTPMethod.POST],
+        url_name="background-image-upload-finalize",
+        url_path="background-image/upload/finalize",
+    )
+    def finalize_background_image_upload(self, request, pk=None):
+        """Check a directly uploaded background and queue its processing."""
+        user_preferences = self.get_object()
+        serializer = DirectUploadFinalizeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = finalize_direct_upload(
+            request,
+            serializer.validated_data["token"],
+            user_preferences,
+            "custom_background_image",
+            max_size_mb=(
+                UserPreferenceCustomBackgroundImageSerializer.PICTURE_MAX_SIZE_MB
+            ),
+        )
+        return self.get_background_job_response(request, job)
+
+    def get_background_job_response(self, request, job):
+        """Return the URL of a background being processed."""
+        return Response(
+            {
+                "custom_background_image_url": generate_presigned_url(
+                    job.target_key,
+                    request,
+                ),
+                "job": ImageProcessingJobSerializer(job).data,
+            },
+            status=get_image_processing_status(job),
+        )
 
     @action(
         detail=True,
@@ -88,18 +203,13 @@ class UserPreferencesViewSet(viewsets.ModelViewSet):
     def user_preference_background_file(self, request, pk=None, filename=None):
         """Get user preference background."""
         user_preferences = self.get_object()
-        if (
-            request.file_key
-            and request.file_key
-            != user_preferences.custom_background_image.name
-        ):
-            raise ValidationError("Invalid file key provided.")
-        content_type = (
-            mimetypes.guess_type(user_preferences.custom_background_image.name)[
-                0
-            ]
-            or "application/octet-stream"
+        key = get_requested_image_key(
+            user_preferences, "custom_background_image", filename
         )
-        return FileResponse(
-            user_preferences.custom_background_image, content_type=content_type
+        if request.file_key and request.file_key != key:
+            raise ValidationError("Invalid file key provided.")
+        if not user_preferences.custom_background_image:
+            raise Http404("Background not found")
+        return build_file_response(
+            request, key, immutable=filename == os.path.basename(key)
         )
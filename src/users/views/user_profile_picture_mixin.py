@@ -1,11 +1,19 @@
+import os
 from http import HTTPMethod
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, JSONParser
 from rest_framework.response import Response
 from users.serializers.user_serializers import UserProfilePictureSerializer
-from django.http import HttpResponse
 from django.urls import reverse
 
+from _config.parsers import StorageMultiPartParser
+from _config.services.storage_utils.file_response import build_file_response
+from files.jobs import create_image_processing_job
+from files.serializers import ImageProcessingJobSerializer
+from files.variants import get_requested_image_key
+from files.views import get_image_processing_status
+
 
 class UserProfilePictureMixin:
     @action(
@@ -19,26 +27,39 @@ class UserProfilePictureMixin:
         user = self.get_object()
         if not user.profile_picture:
             return Response("No profile picture.", status=status.HTTP_404_NOT_FOUND)
-        return HttpResponse(user.profile_picture, content_type="image/png")
+        key = get_requested_image_key(user, "profile_picture", filename)
+        return build_file_response(
+            request, key, immutable=filename == os.path.basename(key)
+        )
 
     @action(
         detail=True,
         methods=[HTTPMethod.PUT],
         url_name="profile",
         url_path="profile",
+        parser_classes=[JSONParser, FormParser, StorageMultiPartParser],
     )
     def set_profile_picture(self, request, pk=None):
         """Update user profile picture."""
         serializer = UserProfilePictureSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = self.get_object()
-        user.profile_picture = serializer.validated_data["profile_picture"]
-        user.save()
-        file_name = user.profile_picture.name.split("/")[-1]
+        image = serializer.validated_data["profile_picture"]
+        if not image:
+            user.profile_picture = None
+            user.save()
+            return Response({"profile_picture_url": None})
+        # Resized off-request, it replaces the current picture once done.
+        job = create_image_processing_job(
+            image, user, "profile_picture", request.user
+        )
+        file_name = job.target_key.split("/")[-1]
         return Response(
             {
                 "profile_picture_url": request.build_absolute_uri(
                     reverse("user-profile", args=[user.id, file_name])
-                )
-            }
+                ),
+                "job": ImageProcessingJobSerializer(job).data,
+            },
+            status=get_image_processing_status(job),
         )
@@ -42,7 +42,8 @@ class UserViewSet(viewsets.ModelViewSet, UserProfilePictureMixin):
     filterset_fields = ["is_active", "system_role"]
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        # Groups are serialized, and checked for the admin group, per user.
+        queryset = super().get_queryset().prefetch_related("groups")
         return queryset
 
     def get_permissions(self):
@@ -5,5 +5,7 @@ if [ -z "${CARROT_PORT}" ]; then
 fi
 python manage.py collectstatic --noinput
 python manage.py migrate --noinput
+python manage.py recover_image_processing_jobs
+python manage.py generate_image_variants
 python -m gunicorn _config.asgi:application -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:$CARROT_PORT
 ```
\ No newline at end of file